@@ -7,11 +7,50 @@ from pathlib import Path
 BASE_DIR     = Path(__file__).parent.parent
 PERSONA_YAML = BASE_DIR / "data" / "persona.yaml"
 RESUME_PDF   = BASE_DIR / "data" / "resume.pdf"
+JOB_DB       = BASE_DIR / "output" / "jobs.sqlite3"
+BATCH_DIR    = BASE_DIR / "output" / "batches"
+
+# Generated letters are cached by request hash so re-runs don't pay twice
+LETTER_CACHE_DIR          = BASE_DIR / "output" / "cache" / "letters"
+LETTER_CACHE_MAX_MB       = 50
+LETTER_CACHE_MAX_AGE_DAYS = 30
+
+# The resume is cleaned once (and optionally condensed by the model) per PDF
+RESUME_CACHE_DIR    = BASE_DIR / "output" / "cache" / "resume"
+RESUME_CONDENSE     = False   # ask the model for a shorter fact sheet
+RESUME_TOKEN_BUDGET = 600     # target size of the condensed resume
 
 # OpenAI settings
 OPENAI_MODEL       = "gpt-3.5-turbo"
 OPENAI_TEMPERATURE = 0.7
 OPENAI_MAX_TOKENS  = 500
+OPENAI_CONCURRENCY = 8      # letters generated in parallel
+OPENAI_TIMEOUT     = 60.0   # seconds per request
+OPENAI_RPM         = 500    # starting request budget; corrected from response headers
+OPENAI_TPM         = 200_000
+OPENAI_MAX_RETRIES = 6      # retries of a 429/5xx before giving up on a letter
+
+# Only jobs matching the resume at least this share of the day's best match
+# get a letter, and at most RELEVANCE_TOP_K of them (None = no limit)
+RELEVANCE_THRESHOLD = 0.25
+RELEVANCE_TOP_K     = 50
+
+# Job descriptions are cut to this many tokens (≈4 chars each) in the prompt
+DESCRIPTION_TOKEN_BUDGET = 700
+
+# Email pacing (Gmail allows roughly 500 messages a day)
+SMTP_PER_MINUTE = 20
+SMTP_BURST      = 5
+SMTP_DAILY_CAP  = 500
+MAIL_COUNT_FILE = BASE_DIR / "output" / "mail_count.json"
+
+# Rendered emails are spooled here before sending (see emailer/outbox.py)
+OUTBOX_DIR          = BASE_DIR / "output" / "outbox"
+OUTBOX_MAX_ATTEMPTS = 5
+MAIL_FROM           = None   # From address of spooled emails; None = GMAIL_USER from .env
+
+# Every email sent, so a job is never applied to twice (see emailer/send_ledger.py)
+SEND_LEDGER_DB = BASE_DIR / "output" / "sent.sqlite3"
 
 # Cover-letter style
 AI_TONE    = "warm, conversational, and slightly playful"
@@ -0,0 +1,170 @@
+
+"""
+Near-duplicate detection for job ads (re-posts, agency copies, one ad per
+municipality) using word shingles, MinHash and LSH banding.
+
+    python -m data.dedup                 # mark duplicates across the whole job store
+    python -m data.dedup output/raw/D    # import a scrape folder first, then mark
+
+Signatures use one-permutation hashing: every shingle is hashed once and
+dropped into one of NUM_PERM bins, keeping the minimum per bin, so building a
+signature is linear in the ad's length. Ads sharing any LSH band become
+candidate pairs, which are confirmed by their exact shingle Jaccard.
+"""
+
+import re
+import zlib
+import argparse
+import itertools
+from collections import defaultdict
+
+SHINGLE_SIZE = 5      # words per shingle
+NUM_PERM     = 128    # signature length
+BANDS        = 32     # LSH bands of NUM_PERM // BANDS rows each
+THRESHOLD    = 0.7    # Jaccard similarity at which two ads count as duplicates
+
+_WORD_RE = re.compile(r"\w+")
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> set[int]:
+    """Hashed k-word shingles of `text` (case- and punctuation-insensitive)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < k:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + k]).encode("utf-8"))
+        for i in range(len(words) - k + 1)
+    }
+
+def signature(hashes: set[int], num_perm: int = NUM_PERM) -> tuple[int, ...]:
+    """One-permutation MinHash signature, with empty bins densified by rotation."""
+    empty = 1 << 32
+    bins  = [empty] * num_perm
+    for h in hashes:
+        b, v = h % num_perm, h // num_perm
+        if v < bins[b]:
+            bins[b] = v
+    if not hashes:
+        return tuple(bins)
+    # Borrow from the next non-empty bin to the right, offset so borrowed values differ
+    for i in range(num_perm):
+        j, step = i, 0
+        while bins[j] == empty:
+            j = (j + 1) % num_perm
+            step += 1
+        if step:
+            bins[i] = bins[j] + step * empty
+    return tuple(bins)
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def find_clusters(docs: dict, threshold: float = THRESHOLD,
+                  bands: int = BANDS, num_perm: int = NUM_PERM) -> list[list]:
+    """
+    Group the keys of `docs` ({id: text}) into clusters of near-duplicates.
+    Only clusters with two or more members are returned.
+    """
+    rows = num_perm // bands
+    shingle_sets = {key: shingles(text) for key, text in docs.items()}
+
+    buckets = defaultdict(list)
+    for key, hashes in shingle_sets.items():
+        if not hashes:
+            continue
+        sig = signature(hashes, num_perm)
+        for band in range(bands):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append(key)
+
+    # Union-find over confirmed candidate pairs
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    # Every pair sharing a bucket is a candidate (buckets are small); a pair
+    # seen in several bands is only checked once
+    checked = set()
+    for members in buckets.values():
+        for a, b in itertools.combinations(members, 2):
+            pair = frozenset((a, b))
+            if pair in checked or find(a) == find(b):
+                continue
+            checked.add(pair)
+            if jaccard(shingle_sets[a], shingle_sets[b]) >= threshold:
+                parent[find(b)] = find(a)
+
+    clusters = defaultdict(list)
+    for key in parent:
+        clusters[find(key)].append(key)
+    return [c for c in clusters.values() if len(c) > 1]
+
+def canonical_key(job: dict):
+    """
+    Sort key choosing a cluster's canonical ad: one with a contact email first
+    (a copy we can't apply to must never hide one we can), then the first seen.
+    """
+    return (not job.get("email"), job.get("first_seen") or job["scraped_on"], job["ad_id"])
+
+def skip_duplicates(urls: list[str], duplicate_urls: dict[str, str], applied) -> dict[str, str]:
+    """
+    Which of today's ads (`urls`) to skip as copies: {url: url of the copy
+    applied to instead}. A copy is only skipped for its canonical ad when that
+    ad is in today's batch too or `applied(url)` says it was applied to before;
+    otherwise (it was filtered out, or predates the pipeline) the first of
+    today's copies stands in for it.
+    """
+    today    = set(urls)
+    stand_in = {}
+    skip     = {}
+    for url in urls:
+        canonical = duplicate_urls.get(url)
+        if canonical is None:
+            continue
+        if canonical in today or applied(canonical):
+            skip[url] = canonical
+        elif canonical in stand_in:
+            skip[url] = stand_in[canonical]
+        else:
+            stand_in[canonical] = url
+    return skip
+
+def mark_duplicates(store, threshold: float = THRESHOLD) -> tuple[int, int]:
+    """
+    Cluster every job in `store` and record which ad each duplicate copies.
+    Returns (clusters found, duplicates marked).
+    """
+    jobs = {job["ad_id"]: job for job in store.search()}
+    docs = {ad_id: f"{job['title']}\n{job['description']}" for ad_id, job in jobs.items()}
+    clusters = find_clusters(docs, threshold)
+
+    duplicates = {}
+    for cluster in clusters:
+        members   = sorted((jobs[k] for k in cluster), key=canonical_key)
+        canonical = members[0]["ad_id"]
+        for job in members[1:]:
+            duplicates[job["ad_id"]] = canonical
+    store.set_duplicates(duplicates)
+    return len(clusters), len(duplicates)
+
+def main():
+    from data.job_store import JobStore
+
+    parser = argparse.ArgumentParser(description="Mark near-duplicate job ads in the job store.")
+    parser.add_argument("folder", nargs="?", help="scrape folder to import before deduplicating")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    with JobStore() as store:
+        if args.folder:
+            store.import_txt(args.folder)
+        clusters, dups = mark_duplicates(store, args.threshold)
+    print(f"Found {clusters} clusters; marked {dups} ads as duplicates")
+
+if __name__ == "__main__":
+    main()
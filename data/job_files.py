@@ -0,0 +1,56 @@
+
+import os
+import re
+from pathlib import Path
+
+AD_ID_RE = re.compile(r"/platsbanken/annonser/(\w+)")
+
+def ad_id_from_url(url: str) -> str | None:
+    """Pull the ad ID out of a `/platsbanken/annonser/<id>` link."""
+    m = AD_ID_RE.search(url or "")
+    return m.group(1) if m else None
+
+def slugify(text: str) -> str:
+    s = text.lower()
+    s = re.sub(r"[^\w\s-]", "", s)
+    s = re.sub(r"[\s_-]+", "-", s).strip("-")
+    return s or "job"
+
+def write_job(output_dir: str, number: int, job: dict) -> str:
+    """Save `job` as `NNN-slug.txt` in `output_dir` and return the path."""
+    slug  = slugify(job["title"])
+    fname = f"{number:03d}-{slug}.txt"
+    path  = os.path.join(output_dir, fname)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Title: {job['title']}\n")
+        f.write(f"Company: {job['company']}\n")
+        f.write(f"Location: {job['location']}\n\n")
+        f.write("Description:\n")
+        f.write(job["description"] + "\n\n")
+        f.write(f"Contact Email: {job['email']}\n")
+        f.write(f"URL: {job['url']}\n")
+    return path
+
+def read_job(path: str) -> dict:
+    """Parse a job file written by `write_job` back into its fields."""
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    job = {}
+    for i, line in enumerate(lines):
+        if line.startswith("Title:"):
+            job["title"] = line.split("Title:",1)[1].strip()
+        elif line.startswith("Company:"):
+            job["company"] = line.split("Company:",1)[1].strip() or "Hiring Team"
+        elif line.startswith("Location:"):
+            job["location"] = line.split("Location:",1)[1].strip()
+        elif line.startswith("Description:"):
+            desc = []
+            for dl in lines[i+1:]:
+                if dl.startswith("Contact Email:") or dl.startswith("URL:"):
+                    break
+                desc.append(dl)
+            job["description"] = "\n".join(desc).strip()
+        elif line.startswith("Contact Email:"):
+            job["email"] = line.split("Contact Email:",1)[1].strip()
+        elif line.startswith("URL:"):
+            job["url"] = line.split("URL:",1)[1].strip()
+    return job
@@ -0,0 +1,225 @@
+
+"""
+SQLite store for scraped jobs, with full-text search over title and description.
+
+    python -m data.job_store search python --since 2026-10-01 --location Stockholm
+    python -m data.job_store export 2026-10-17 output/raw/2026-10-17
+    python -m data.job_store import output/raw/2026-10-17
+"""
+
+import os
+import sqlite3
+import argparse
+import datetime
+from pathlib import Path
+
+from config.settings import JOB_DB
+from data.job_files  import ad_id_from_url, write_job, read_job
+
+FIELDS = ("ad_id", "title", "company", "location", "description", "email", "url", "scraped_on")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    ad_id       TEXT PRIMARY KEY,
+    title       TEXT NOT NULL,
+    company     TEXT NOT NULL DEFAULT '',
+    location    TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    email       TEXT NOT NULL DEFAULT '',
+    url         TEXT NOT NULL,
+    scraped_on  TEXT NOT NULL,             -- ISO date of the latest scrape
+    first_seen  TEXT,                      -- ISO date of the first scrape
+    duplicate_of TEXT                      -- canonical ad_id if this is a near-duplicate
+);
+CREATE INDEX IF NOT EXISTS jobs_scraped_on ON jobs(scraped_on);
+CREATE INDEX IF NOT EXISTS jobs_location   ON jobs(location COLLATE NOCASE);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description,
+    content='jobs', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+-- Keep the external-content FTS index in step with the jobs table
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO jobs_fts(rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
+"""
+
+# first_seen is set on insert only, so it survives later scrapes of the same ad
+UPSERT = f"""
+INSERT INTO jobs ({", ".join(FIELDS)}, first_seen)
+VALUES ({", ".join(":" + f for f in FIELDS)}, :scraped_on)
+ON CONFLICT(ad_id) DO UPDATE SET
+    {", ".join(f"{f} = excluded.{f}" for f in FIELDS[1:])}
+"""
+
+def fts_query(text: str) -> str:
+    """
+    `text` as an FTS5 query matching all of its words, each quoted as a string
+    so input like "c++" or "node.js" isn't read as query syntax. A trailing
+    `*` is kept as a prefix match.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word   = word.rstrip("*") if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+class JobStore:
+    """Typed, searchable store of scraped jobs (SQLite in WAL mode)."""
+
+    def __init__(self, path: str = JOB_DB):
+        path = str(path)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = {r["name"] for r in self.conn.execute("PRAGMA table_info(jobs)")}
+        if "duplicate_of" not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN duplicate_of TEXT")
+        if "first_seen" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE jobs ADD COLUMN first_seen TEXT")
+                self.conn.execute("UPDATE jobs SET first_seen = scraped_on")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def upsert_jobs(self, jobs: list[dict], scraped_on: str | None = None) -> int:
+        """Insert or refresh `jobs` in one transaction. Returns the number written."""
+        scraped_on = scraped_on or datetime.date.today().isoformat()
+        rows = []
+        for job in jobs:
+            row = {f: job.get(f) or "" for f in FIELDS}
+            row["ad_id"]      = job.get("ad_id") or ad_id_from_url(job["url"]) or job["url"]
+            row["scraped_on"] = job.get("scraped_on") or scraped_on
+            rows.append(row)
+        with self.conn:
+            self.conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    def search(self, text: str | None = None, since: str | None = None,
+               location: str | None = None, limit: int | None = None) -> list[dict]:
+        """
+        Jobs containing every word of `text` in title/description (best matches first),
+        optionally scraped on or after `since` and in a location containing
+        `location`. Without `text`, newest jobs come first.
+        """
+        sql, params, where = "SELECT jobs.* FROM jobs", [], []
+        if text and text.strip():
+            sql += " JOIN jobs_fts ON jobs_fts.rowid = jobs.rowid"
+            where.append("jobs_fts MATCH ?")
+            params.append(fts_query(text))
+        if since:
+            where.append("jobs.scraped_on >= ?")
+            params.append(since)
+        if location:
+            where.append("jobs.location LIKE ?")
+            params.append(f"%{location}%")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + ("bm25(jobs_fts)" if text and text.strip() else "jobs.scraped_on DESC, jobs.rowid")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(r) for r in self.conn.execute(sql, params)]
+
+    def jobs_on(self, date: str) -> list[dict]:
+        """All jobs last scraped on `date`, in insertion order."""
+        rows = self.conn.execute(
+            "SELECT * FROM jobs WHERE scraped_on = ? ORDER BY rowid", (date,)
+        )
+        return [dict(r) for r in rows]
+
+    def set_duplicates(self, duplicates: dict[str, str]):
+        """Replace the duplicate markings with `duplicates` ({ad_id: canonical ad_id})."""
+        with self.conn:
+            self.conn.execute("UPDATE jobs SET duplicate_of = NULL WHERE duplicate_of IS NOT NULL")
+            self.conn.executemany(
+                "UPDATE jobs SET duplicate_of = ? WHERE ad_id = ?",
+                [(canonical, ad_id) for ad_id, canonical in duplicates.items()],
+            )
+
+    def duplicate_urls(self) -> dict[str, str]:
+        """{url of a duplicate ad: url of its canonical ad}."""
+        rows = self.conn.execute("""
+            SELECT d.url, c.url FROM jobs d JOIN jobs c ON c.ad_id = d.duplicate_of
+        """)
+        return dict(rows.fetchall())
+
+    def export_txt(self, date: str, output_dir: str) -> int:
+        """Write the jobs scraped on `date` as main.py-style `NNN-slug.txt` files."""
+        os.makedirs(output_dir, exist_ok=True)
+        jobs = self.jobs_on(date)
+        for number, job in enumerate(jobs, start=1):
+            write_job(output_dir, number, job)
+        return len(jobs)
+
+    def import_txt(self, folder: str, scraped_on: str | None = None) -> int:
+        """Load a folder of `.txt` job files (a YYYY-MM-DD folder name is taken as the date)."""
+        folder = Path(folder)
+        if scraped_on is None:
+            try:
+                scraped_on = datetime.date.fromisoformat(folder.name).isoformat()
+            except ValueError:
+                scraped_on = None
+        jobs = [read_job(str(p)) for p in sorted(folder.glob("*.txt"))]
+        return self.upsert_jobs([j for j in jobs if j.get("url")], scraped_on)
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and convert the job store.")
+    parser.add_argument("--db", default=str(JOB_DB))
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("search", help="full-text search")
+    p.add_argument("text", nargs="?")
+    p.add_argument("--since")
+    p.add_argument("--location")
+    p.add_argument("--limit", type=int, default=50)
+
+    p = sub.add_parser("export", help="write one day's jobs as .txt files")
+    p.add_argument("date")
+    p.add_argument("output_dir")
+
+    p = sub.add_parser("import", help="load a folder of .txt job files")
+    p.add_argument("folder")
+
+    args = parser.parse_args()
+    with JobStore(args.db) as store:
+        if args.cmd == "search":
+            for job in store.search(args.text, args.since, args.location, args.limit):
+                print(f"{job['scraped_on']}  {job['title']} – {job['company']} ({job['location']})")
+                print(f"            {job['url']}")
+        elif args.cmd == "export":
+            n = store.export_txt(args.date, args.output_dir)
+            print(f"Exported {n} jobs to {args.output_dir}")
+        else:
+            n = store.import_txt(args.folder)
+            print(f"Imported {n} jobs from {args.folder}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+
+"""
+Rank job ads by how well they match the candidate, so letters and emails are
+only spent on the best ones.
+
+    python -m data.relevance output/raw/D      # print a scrape folder's ads, best first
+
+The day's ads go into an inverted index and are scored with BM25 against a
+query made from the resume text and the persona's skills (weighted higher).
+Scores are reported relative to the day's best match, so 1.0 is the top ad.
+"""
+
+import re
+import math
+import argparse
+from collections import Counter, defaultdict
+
+from config.settings import RELEVANCE_THRESHOLD, RELEVANCE_TOP_K
+
+K1           = 1.5   # BM25 term-frequency saturation
+B            = 0.75  # BM25 length normalisation
+SKILL_WEIGHT = 3.0   # query weight of a persona skill term vs a resume term
+TITLE_WEIGHT = 2     # times the title is counted in an ad's text
+
+_TERM_RE = re.compile(r"[a-zåäöéü0-9][a-zåäöéü0-9+#]*(?:\.[a-z0-9]+)*")
+
+def terms(text: str) -> list[str]:
+    """Lower-cased terms, keeping tech names like c#, c++ and node.js whole."""
+    return _TERM_RE.findall(text.lower())
+
+class BM25Index:
+    """Inverted index over `docs`, scored with Okapi BM25."""
+
+    def __init__(self, docs: list[str], k1: float = K1, b: float = B):
+        self.k1, self.b = k1, b
+        self.postings   = defaultdict(list)   # term -> [(doc, tf)]
+        self.lengths    = []
+        for idx, doc in enumerate(docs):
+            counts = Counter(terms(doc))
+            self.lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings[term].append((idx, tf))
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if docs else 0.0
+
+    def idf(self, term: str) -> float:
+        n, df = len(self.lengths), len(self.postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: dict[str, float]) -> list[float]:
+        """BM25 score of every doc for `query` ({term: weight})."""
+        out  = [0.0] * len(self.lengths)
+        norm = [self.k1 * (1 - self.b + self.b * l / self.avg_length) if self.avg_length else self.k1
+                for l in self.lengths]
+        for term, weight in query.items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            w = weight * self.idf(term) * (self.k1 + 1)
+            for idx, tf in postings:
+                out[idx] += w * tf / (tf + norm[idx])
+        return out
+
+def profile_query(resume: str, skills: list[str]) -> dict[str, float]:
+    """Query terms from the resume (weight 1) and the persona skills (SKILL_WEIGHT)."""
+    query = dict.fromkeys(terms(resume), 1.0)
+    for skill in skills:
+        for term in terms(skill):
+            query[term] = SKILL_WEIGHT
+    return query
+
+def job_text(job: dict) -> str:
+    return "\n".join([job.get("title", "")] * TITLE_WEIGHT + [job.get("description", "")])
+
+def rank_jobs(jobs: list[dict], resume: str, skills: list[str],
+              threshold: float = RELEVANCE_THRESHOLD,
+              top_k: int | None = RELEVANCE_TOP_K,
+              candidates: list[int] | None = None) -> list[tuple[int, float]]:
+    """
+    [(job index, relative score)] best first, for the jobs scoring at least
+    `threshold` of the best one, at most `top_k` of them. All `jobs` feed the
+    index statistics; only `candidates` (default: all) are ranked. A
+    `threshold` of 0 keeps every candidate even when none matches at all.
+    """
+    raw  = BM25Index([job_text(j) for j in jobs]).scores(profile_query(resume, skills))
+    pool = range(len(jobs)) if candidates is None else candidates
+    best = max((raw[i] for i in pool), default=0.0)
+    if best <= 0:
+        # Nothing shares a term with the profile: no order to give, so keep
+        # them all (in their own order) only if no minimum score was asked for
+        kept = [(i, 0.0) for i in pool] if threshold <= 0 else []
+        return kept[:top_k] if top_k else kept
+    ranked = sorted(((i, raw[i] / best) for i in pool), key=lambda p: -p[1])
+    ranked = [(i, s) for i, s in ranked if s >= threshold]
+    return ranked[:top_k] if top_k else ranked
+
+def main():
+    import yaml
+    from pathlib import Path
+    from config.settings import PERSONA_YAML, RESUME_PDF
+    from data.job_files import read_job
+    from data.resume_utils import load_resume
+
+    parser = argparse.ArgumentParser(description="Rank a scrape folder's ads against the resume.")
+    parser.add_argument("folder")
+    parser.add_argument("--threshold", type=float, default=0.0)
+    parser.add_argument("--top-k",     type=int)
+    args = parser.parse_args()
+
+    with open(PERSONA_YAML, encoding="utf-8") as f:
+        persona = yaml.safe_load(f)
+    resume = load_resume(str(RESUME_PDF))
+    files  = sorted(Path(args.folder).glob("*.txt"))
+    jobs   = [read_job(p) for p in files]
+    for idx, score in rank_jobs(jobs, resume, persona.get("skills", []),
+                                args.threshold, args.top_k):
+        print(f"{score:5.2f}  {files[idx].name}  {jobs[idx].get('title', '')}")
+
+if __name__ == "__main__":
+    main()
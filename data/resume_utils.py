@@ -1,11 +1,116 @@
 
+import re
+import json
+import hashlib
+from collections import Counter
+from pathlib import Path
+
 import fitz  # PyMuPDF
 
+from config.settings import (
+    RESUME_CACHE_DIR, RESUME_CONDENSE, RESUME_TOKEN_BUDGET,
+    OPENAI_MODEL,
+)
+
+def extract_resume_pages(path: str) -> list[str]:
+    """Extract the text of each page of the PDF at `path`."""
+    with fitz.open(path) as doc:
+        return [page.get_text() for page in doc]
+
 def extract_resume_text(path: str) -> str:
     """Extract all text from the PDF at `path`."""
-    text_pages = []
-    with fitz.open(path) as doc:
-        for page in doc:
-            text_pages.append(page.get_text())
-    return "\n".join(text_pages)
+    return "\n".join(extract_resume_pages(path))
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (≈4 characters per token), good enough for budgeting."""
+    return (len(text) + 3) // 4
+
+PAGE_NUMBER_RE = re.compile(r"^(?:page|sida)?\s*(\d+)(?:\s*(?:/|of|av)\s*\d+)?$", re.IGNORECASE)
+
+def _is_page_number(line: str, page_no: int) -> bool:
+    """`line` reads as the number of page `page_no` ("3", "Page 3 of 4", "3/4")."""
+    m = PAGE_NUMBER_RE.match(line)
+    return bool(m) and int(m.group(1)) == page_no
+
+def clean_resume_text(pages: list[str]) -> str:
+    """
+    Strip PDF layout noise: page numbers, headers/footers repeated on several
+    pages, words hyphenated across line breaks and runs of whitespace.
+    """
+    pages = [
+        [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in page.splitlines()]
+        for page in pages
+    ]
+
+    # Lines near the top/bottom of more than one page are running headers/footers
+    edges = Counter()
+    if len(pages) > 1:
+        for lines in pages:
+            lines = [l for l in lines if l]
+            edges.update(set(lines[:2] + lines[-2:]))
+    repeated = {line for line, n in edges.items() if n > 1}
+
+    # A number line is only a page number at the page's edge and in sequence,
+    # so year lines such as "2019" or "2015/2019" are kept
+    kept = []
+    for page_no, lines in enumerate(pages, start=1):
+        filled = [i for i, l in enumerate(lines) if l]
+        edge   = set(filled[:1] + filled[-1:])
+        kept.extend(
+            line for i, line in enumerate(lines)
+            if line not in repeated and not (i in edge and _is_page_number(line, page_no))
+        )
+    text = "\n".join(kept)
+
+    text = re.sub(r"(\w)-\n([a-zåäö])", r"\1\2", text)   # de-hyphenate
+    text = re.sub(r"\n{3,}", "\n\n", text)               # collapse blank runs
+    return text.strip()
+
+def condense_resume_text(text: str, token_budget: int) -> str:
+    """Have the model rewrite the resume as a compact fact sheet under `token_budget`."""
+    import openai
+
+    resp = openai.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[{"role":"user","content":(
+            f"Condense this resume into a compact plain-text fact sheet of at most "
+            f"{token_budget} tokens. Keep every employer, role, date, degree, "
+            f"technology and concrete achievement; drop filler and formatting.\n\n{text}"
+        )}],
+        temperature=0,
+        max_tokens=token_budget,
+    )
+    return resp.choices[0].message.content.strip()
+
+def load_resume(path: str, condense: bool = RESUME_CONDENSE,
+                token_budget: int = RESUME_TOKEN_BUDGET) -> str:
+    """
+    Resume text for prompting: cleaned and, if `condense` is set, shortened by
+    the model to `token_budget`. The result is cached on disk keyed by the
+    PDF's hash (with the raw text's token count), so the PDF is only parsed
+    and the model only asked again when the PDF changes.
+    """
+    pdf    = Path(path)
+    digest = hashlib.sha256(pdf.read_bytes()).hexdigest()[:16]
+    mode   = f"condensed-{token_budget}" if condense else "clean"
+    cached = Path(RESUME_CACHE_DIR) / f"{pdf.stem}-{digest}-{mode}.json"
+
+    try:
+        entry = json.loads(cached.read_text(encoding="utf-8"))
+        text, raw_len = entry["text"], entry["raw_tokens"]
+    except (FileNotFoundError, ValueError, KeyError):
+        pages   = extract_resume_pages(str(pdf))
+        raw_len = estimate_tokens("\n".join(pages))
+        text    = clean_resume_text(pages)
+        if condense and estimate_tokens(text) > token_budget:
+            text = condense_resume_text(text, token_budget)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"raw_tokens": raw_len, "text": text}, ensure_ascii=False),
+                       encoding="utf-8")
+        tmp.replace(cached)
 
+    new_len = estimate_tokens(text)
+    saved   = 100 * (raw_len - new_len) / raw_len if raw_len else 0
+    print(f"📄 Resume: ~{raw_len} → ~{new_len} tokens per letter ({saved:.0f}% fewer, {mode})")
+    return text
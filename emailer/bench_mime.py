@@ -0,0 +1,80 @@
+# emailer/bench_mime.py
+"""
+Micro-benchmark of rendering one application email: the original path (read
+and base64-encode the resume into a fresh message, flatten it, then fix line
+endings and dot-stuff it the way smtplib does) against the cached attachment
+part spliced into streamed DATA chunks.
+
+    python -m emailer.bench_mime --messages 300 --resume data/resume.pdf
+"""
+
+import os
+import re
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from emailer.gmail_sender import build_message, render_application, cached_attachment
+
+BODY = "Dear Hiring Team,\n\n" + "I would love to join your team. " * 60 + "\n\nBest regards"
+
+def original(i: int, resume: str) -> int:
+    msg  = build_message("me@example.com", f"jobb{i}@example.com", f"Application {i}", BODY, resume)
+    data = msg.as_bytes()
+    # What smtplib.SMTP.data() does to a bytes message before writing it
+    data = re.sub(rb"(?m)^\.", b"..", data)
+    data = re.sub(rb"(?:\r\n|\n|\r(?!\n))", b"\r\n", data)
+    return len(data)
+
+def cached(i: int, resume: str) -> int:
+    chunks = render_application("me@example.com", f"jobb{i}@example.com",
+                                f"Application {i}", BODY, resume)
+    return sum(len(c) for c in chunks)
+
+def measure(fn, messages: int, resume: str) -> tuple[float, float, float]:
+    """(ms per message, max and mean KiB of peak memory while rendering one)."""
+    fn(0, resume)   # warm up (fills the attachment cache for `cached`)
+    t0 = time.perf_counter()
+    for i in range(messages):
+        fn(i, resume)
+    per_msg = 1000 * (time.perf_counter() - t0) / messages
+
+    tracemalloc.start()
+    peak = 0
+    total = 0
+    for i in range(min(messages, 50)):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        fn(i, resume)
+        p = tracemalloc.get_traced_memory()[1]
+        peak  = max(peak, p - before)
+        total += p - before
+    tracemalloc.stop()
+    return per_msg, peak / 1024, total / min(messages, 50) / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--resume", help="PDF to attach (default: a synthetic 150 KB file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resume = args.resume
+        if not resume:
+            resume = str(Path(tmp) / "resume.pdf")
+            Path(resume).write_bytes(b"%PDF-1.4\n" + os.urandom(150_000))
+        size = cached(0, resume)
+        print(f"message size: {size / 1024:.0f} KiB "
+              f"(attachment {len(cached_attachment(resume).wire) / 1024:.0f} KiB encoded)")
+        base = None
+        for label, fn in (("original", original), ("cached", cached)):
+            ms, peak, alloc = measure(fn, args.messages, resume)
+            note = f"  ({base / ms:.1f}x faster)" if base else ""
+            base = base or ms
+            print(f"{label:9} {ms:7.3f} ms/message, peak memory {peak:7.1f} KiB "
+                  f"(mean {alloc:7.1f} KiB){note}")
+
+if __name__ == "__main__":
+    main()
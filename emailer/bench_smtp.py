@@ -0,0 +1,64 @@
+# emailer/bench_smtp.py
+"""
+Time one-connection-per-email against a pooled `GmailSender`, on the local
+SMTP sink.
+
+    python -m emailer.bench_smtp --messages 50 --connect-delay 0.15 --auth-delay 0.1
+"""
+
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+from emailer import smtp_sink
+from emailer.gmail_sender import GmailSender
+
+BODY = "Dear Hiring Team,\n\n" + "I would love to join your team. " * 60 + "\n\nBest regards"
+
+def run(port: int, messages: int, attachment: str, pooled: bool) -> tuple[float, int, int]:
+    """Send `messages` emails; returns (seconds, logins, reconnects)."""
+    def sender():
+        return GmailSender("bench@example.com", "secret", host="127.0.0.1",
+                           port=port, starttls=False)
+    logins = reconnects = 0
+    t0 = time.perf_counter()
+    s  = sender() if pooled else None
+    for i in range(messages):
+        one = s or sender()
+        one.send_application(f"jobb{i}@example.com", f"Application {i}", BODY, attachment)
+        if not pooled:
+            one.close()
+            logins += one.connects
+    if pooled:
+        s.close()
+        logins, reconnects = s.connects, s.reconnects
+    return time.perf_counter() - t0, logins, reconnects
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages",      type=int,   default=50)
+    parser.add_argument("--connect-delay", type=float, default=0.15,
+                        help="simulated TCP+TLS setup per connection")
+    parser.add_argument("--auth-delay",    type=float, default=0.1,
+                        help="simulated login per connection")
+    parser.add_argument("--max-per-connection", type=int, default=0,
+                        help="sink drops a session after this many messages")
+    args = parser.parse_args()
+
+    server = smtp_sink.serve(connect_delay=args.connect_delay, auth_delay=args.auth_delay,
+                             max_per_connection=args.max_per_connection)
+    port   = server.server_address[1]
+    with tempfile.TemporaryDirectory() as tmp:
+        resume = Path(tmp) / "resume.pdf"
+        resume.write_bytes(b"%PDF-1.4\n" + bytes(range(256)) * 600)
+
+        for label, pooled in (("per email", False), ("pooled", True)):
+            elapsed, logins, reconnects = run(port, args.messages, str(resume), pooled)
+            print(f"{label:10} {elapsed:6.2f} s  ({1000 * elapsed / args.messages:6.1f} ms/email, "
+                  f"{logins} logins, {reconnects} reconnects)")
+    print(f"sink: {server.stats.messages} messages over {server.stats.connections} connections")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,32 @@
 # emailer/gmail_sender.py
 
 import os
+import re
+import time
+import queue
+import socket
+import hashlib
 import smtplib
 import mimetypes
-from email.message import EmailMessage
+from email import policy
+from email.generator import BytesGenerator
+from email.message import EmailMessage, MIMEPart
+from email.utils import formatdate, make_msgid
+from io import BytesIO
 
 SMTP_SERVER = "smtp.gmail.com"
 SMTP_PORT   = 587
+SMTP_IDLE   = 60.0   # seconds a session may sit idle before it is NOOP-checked
 
-def send_application(to_address: str, subject: str, body_text: str, attachment_path: str = None):
-    """
-    Sends an email via Gmail SMTP with optional attachment.
-    - to_address: recipient email
-    - subject: email subject
-    - body_text: plain-text body
-    - attachment_path: full path to a file to attach (e.g. your resume PDF)
-    """
-    # Read credentials at call time
-    gmail_user     = os.getenv("GMAIL_USER")
-    gmail_app_pass = os.getenv("GMAIL_APP_PASS")
-    if not gmail_user or not gmail_app_pass:
-        raise RuntimeError("Set GMAIL_USER and GMAIL_APP_PASS in your .env")
-
-    # Create the message
+def build_message(from_address: str, to_address: str, subject: str, body_text: str,
+                  attachment_path: str = None) -> EmailMessage:
+    """A plain-text message, with the file at `attachment_path` attached if given."""
     msg = EmailMessage()
-    msg["From"]    = gmail_user
+    msg["From"]    = from_address
     msg["To"]      = to_address
     msg["Subject"] = subject
     msg.set_content(body_text)
 
-    # Attach a file if provided
     if attachment_path:
         guessed, _ = mimetypes.guess_type(attachment_path)
         if guessed:
@@ -45,11 +42,283 @@ def send_application(to_address: str, subject: str, body_text: str, attachment_p
             subtype=subtype,
             filename=os.path.basename(attachment_path)
         )
+    return msg
+
+class CachedAttachment:
+    """An attachment encoded once: its MIME part and wire bytes (CRLF, dot-stuffed)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            data = f.read()
+        st = os.stat(path)
+        self.stat   = (st.st_mtime_ns, st.st_size)
+        self.sha256 = hashlib.sha256(data).hexdigest()
+
+        guessed, _ = mimetypes.guess_type(path)
+        maintype, subtype = guessed.split("/", 1) if guessed else ("application", "octet-stream")
+        self.part = MIMEPart(policy=policy.SMTP)
+        self.part.set_content(data, maintype=maintype, subtype=subtype,
+                              disposition="attachment", filename=os.path.basename(path))
+        self.wire = _dot_stuff(self.part.as_bytes(policy=policy.SMTP))
+
+_attachments = {}
+
+def cached_attachment(path: str) -> CachedAttachment:
+    """
+    The encoded attachment for `path`, rebuilt only when the file changes: a
+    new mtime or size triggers a re-read, and a new hash a re-encode.
+    """
+    path = os.path.abspath(path)
+    hit  = _attachments.get(path)
+    if hit is not None:
+        st = os.stat(path)
+        if (st.st_mtime_ns, st.st_size) == hit.stat:
+            return hit
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).hexdigest() == hit.sha256:
+                hit.stat = (st.st_mtime_ns, st.st_size)   # touched, not changed
+                return hit
+    _attachments[path] = CachedAttachment(path)
+    return _attachments[path]
+
+def _dot_stuff(data: bytes) -> bytes:
+    return re.sub(rb"(?m)^\.", b"..", data)
+
+class _SplitGenerator(BytesGenerator):
+    """Writes a marker instead of one (shared) part, so the output can be spliced."""
+
+    MARKER = b"\x00ATTACHMENT\x00"
+
+    def __init__(self, *args, skip=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.skip = skip
+
+    def clone(self, fp):
+        clone = super().clone(fp)
+        clone.skip = self.skip
+        return clone
+
+    def flatten(self, msg, unixfrom=False, linesep=None):
+        if msg is self.skip:
+            self._fp.write(self.MARKER)
+            return
+        super().flatten(msg, unixfrom, linesep)
+
+def render_application(from_address: str, to_address: str, subject: str, body_text: str,
+                       attachment_path: str = None) -> list[bytes]:
+    """
+    The message as SMTP DATA chunks (CRLF line endings, dot-stuffed). The
+    attachment's chunk is the cached, pre-encoded one, shared by every message.
+    """
+    msg = EmailMessage(policy=policy.SMTP)
+    msg["From"]       = from_address
+    msg["To"]         = to_address
+    msg["Subject"]    = subject
+    msg["Date"]       = formatdate(localtime=True)
+    msg["Message-ID"] = make_msgid()
+    msg.set_content(body_text)
+    if not attachment_path:
+        return [_dot_stuff(msg.as_bytes())]
+
+    attachment = cached_attachment(attachment_path)
+    msg.make_mixed()
+    msg.attach(attachment.part)
+    buf = BytesIO()
+    _SplitGenerator(buf, policy=policy.SMTP, skip=attachment.part).flatten(msg)
+    head, tail = buf.getvalue().split(_SplitGenerator.MARKER, 1)
+    return [_dot_stuff(head), attachment.wire, _dot_stuff(tail)]
 
-    # Send via Gmail SMTP
-    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as smtp:
+def stream_message(smtp: smtplib.SMTP, from_address: str, to_address: str,
+                   chunks: list[bytes]):
+    """Send pre-rendered DATA `chunks` over `smtp`, writing them straight to the socket."""
+    smtp.ehlo_or_helo_if_needed()
+    code, resp = smtp.mail(from_address)
+    if code != 250:
+        smtp.rset()
+        raise smtplib.SMTPSenderRefused(code, resp, from_address)
+    code, resp = smtp.rcpt(to_address)
+    if code not in (250, 251):
+        smtp.rset()
+        raise smtplib.SMTPRecipientsRefused({to_address: (code, resp)})
+    smtp.putcmd("data")
+    code, resp = smtp.getreply()
+    if code != 354:
+        _rset(smtp)   # close the transaction so the pooled session stays usable
+        raise smtplib.SMTPDataError(code, resp)
+    try:
+        for chunk in chunks:
+            smtp.sock.sendall(chunk)
+        smtp.sock.sendall(b".\r\n" if chunks[-1].endswith(b"\r\n") else b"\r\n.\r\n")
+    except OSError as e:
+        smtp.close()
+        raise smtplib.SMTPServerDisconnected(str(e))
+    code, resp = smtp.getreply()
+    if code != 250:
+        _rset(smtp)
+        raise smtplib.SMTPDataError(code, resp)
+
+def _rset(smtp: smtplib.SMTP):
+    """RSET, ignoring a server that already hung up (as smtplib's `_rset`)."""
+    try:
+        smtp.rset()
+    except smtplib.SMTPServerDisconnected:
+        pass
+
+class GmailSender:
+    """
+    Sends many messages over a few long-lived, authenticated SMTP sessions
+    instead of a new connection, TLS handshake and login per email.
+
+        with GmailSender() as sender:
+            for ...:
+                sender.send_application(to, subject, body, resume_path)
+
+    Sessions are opened on demand, up to `sessions` of them (one per thread
+    sending at the same time). A session idle for more than `idle` seconds
+    is checked with NOOP before reuse (call `keepalive` during long pauses to
+    keep them open), and one the server dropped is reconnected and the
+    message sent again.
+    """
+
+    def __init__(self, user: str = None, password: str = None,
+                 host: str = SMTP_SERVER, port: int = SMTP_PORT,
+                 sessions: int = 1, starttls: bool = True, idle: float = SMTP_IDLE):
+        # Read credentials at construction time
+        self.user     = user or os.getenv("GMAIL_USER")
+        self.password = password or os.getenv("GMAIL_APP_PASS")
+        if not self.user or not self.password:
+            raise RuntimeError("Set GMAIL_USER and GMAIL_APP_PASS in your .env")
+        self.host, self.port = host, port
+        self.starttls   = starttls
+        self.idle       = idle
+        # One entry per session slot: (smtp, last used) or None if not connected
+        self.pool       = queue.LifoQueue()
+        for _ in range(sessions):
+            self.pool.put(None)
+        self.connects   = 0
+        self.reconnects = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port)
         smtp.ehlo()
-        smtp.starttls()
-        smtp.login(gmail_user, gmail_app_pass)
-        smtp.send_message(msg)
+        if self.starttls:
+            smtp.starttls()
+            smtp.ehlo()
+        smtp.login(self.user, self.password)
+        # Messages go out as a few large writes; don't let Nagle hold back the last one
+        smtp.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connects += 1
+        return smtp
+
+    def _checkout(self) -> smtplib.SMTP:
+        """A live session, waiting for a free slot and (re)connecting as needed."""
+        entry = self.pool.get()
+        try:
+            if entry is not None:
+                smtp, last_used = entry
+                if time.monotonic() - last_used <= self.idle:
+                    return smtp
+                try:
+                    if smtp.noop()[0] == 250:
+                        return smtp
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    pass
+                smtp.close()
+            return self._connect()
+        except BaseException:
+            self.pool.put(None)
+            raise
+
+    def _checkin(self, smtp: smtplib.SMTP | None):
+        self.pool.put(None if smtp is None else (smtp, time.monotonic()))
+
+    def send(self, msg: EmailMessage):
+        """Send `msg`, reconnecting once if the server dropped the session."""
+        self._deliver(lambda smtp: smtp.send_message(msg))
+
+    def _deliver(self, transfer):
+        """Run `transfer(smtp)` on a pooled session, once more on a fresh one if it dropped."""
+        for attempt in range(2):
+            smtp = self._checkout()
+            try:
+                transfer(smtp)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                smtp.close()
+                self._checkin(None)
+                if attempt:
+                    raise
+                self.reconnects += 1
+                continue
+            except smtplib.SMTPException:
+                self._checkin(smtp)   # refused by the server, the session is fine
+                raise
+            except BaseException:
+                smtp.close()
+                self._checkin(None)
+                raise
+            self._checkin(smtp)
+            return
 
+    def keepalive(self):
+        """NOOP every pooled session idle for over half of `idle`, dropping dead ones."""
+        entries = []
+        while True:
+            try:
+                entries.append(self.pool.get_nowait())
+            except queue.Empty:
+                break
+        for entry in entries:
+            if entry is not None and time.monotonic() - entry[1] > self.idle / 2:
+                smtp = entry[0]
+                try:
+                    entry = (smtp, time.monotonic()) if smtp.noop()[0] == 250 else None
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    entry = None
+                if entry is None:
+                    smtp.close()
+            self.pool.put(entry)
+
+    def send_application(self, to_address: str, subject: str, body_text: str,
+                         attachment_path: str = None):
+        chunks = render_application(self.user, to_address, subject, body_text, attachment_path)
+        self._deliver(lambda smtp: stream_message(smtp, self.user, to_address, chunks))
+
+    def send_raw(self, from_address: str, to_address: str, data: bytes):
+        """Send a message already rendered for DATA (see `render_application`)."""
+        self._deliver(lambda smtp: stream_message(smtp, from_address, to_address, [data]))
+
+    def close(self):
+        """Log out of every open session."""
+        entries = []
+        while True:
+            try:
+                entries.append(self.pool.get_nowait())
+            except queue.Empty:
+                break
+        for entry in entries:
+            if entry is not None:
+                try:
+                    entry[0].quit()
+                except (smtplib.SMTPException, OSError):
+                    entry[0].close()
+            self.pool.put(None)
+
+def send_application(to_address: str, subject: str, body_text: str, attachment_path: str = None):
+    """
+    Sends an email via Gmail SMTP with optional attachment.
+    - to_address: recipient email
+    - subject: email subject
+    - body_text: plain-text body
+    - attachment_path: full path to a file to attach (e.g. your resume PDF)
+
+    Opens a connection just for this email; use `GmailSender` to send many.
+    """
+    with GmailSender() as sender:
+        sender.send_application(to_address, subject, body_text, attachment_path)
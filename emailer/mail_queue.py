@@ -0,0 +1,141 @@
+# emailer/mail_queue.py
+"""
+Outbound mail queue: letters are enqueued as they are generated and a sender
+task drains them at a steady pace, so generation never waits on SMTP pauses.
+
+Pacing is a token bucket of `burst` messages refilled at `per_minute`, on top
+of a daily cap (Gmail allows about 500 messages a day) counted across runs.
+A status line with queue depth and send rate is printed as it goes.
+"""
+
+import json
+import time
+import asyncio
+import datetime
+from pathlib import Path
+
+from config.settings import SMTP_PER_MINUTE, SMTP_BURST, SMTP_DAILY_CAP, MAIL_COUNT_FILE
+from generators.rate_limit import TokenBucket
+
+STATUS_EVERY = 15.0   # seconds between status lines while waiting
+
+class DailyCounter:
+    """Messages sent today, persisted so the cap holds across runs."""
+
+    def __init__(self, path: Path = MAIL_COUNT_FILE):
+        self.path  = Path(path)
+        self.today = datetime.date.today().isoformat()
+        try:
+            saved = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            saved = {}
+        self.count = saved.get(self.today, 0)
+
+    def add(self, n: int = 1):
+        self.count += n
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({self.today: self.count}), encoding="utf-8")
+        tmp.replace(self.path)
+
+class MailQueue:
+    """
+    Queue of outgoing emails drained by `run()`:
+
+        mail  = MailQueue(sender)
+        drain = asyncio.create_task(mail.run())
+        mail.put("job 1", to_address=..., subject=..., body_text=..., attachment_path=...)
+        ...
+        await mail.close()
+
+    Each item is sent with `send(**fields)` in a worker thread; `send`
+    defaults to `sender.send_application`, and may return False to report
+    that it skipped the item. `sent`, `skipped`, `failed` and `unsent` (left
+    over when the daily cap is hit) hold the labels of the items.
+    """
+
+    def __init__(self, sender, per_minute: float = SMTP_PER_MINUTE,
+                 burst: int = SMTP_BURST, daily_cap: int = SMTP_DAILY_CAP,
+                 counter: DailyCounter | None = None, send=None):
+        self.sender    = sender
+        self.send      = send or sender.send_application
+        self.bucket    = TokenBucket(burst, burst * 60 / per_minute)
+        self.daily_cap = daily_cap
+        self.counter   = counter or DailyCounter()
+        self.queue     = asyncio.Queue()
+        self.sent      = []
+        self.skipped   = []
+        self.failed    = []
+        self.unsent    = []
+        self.started   = time.monotonic()
+        self.last_status = 0.0
+
+    def put(self, label: str, **fields):
+        self.queue.put_nowait((label, fields))
+
+    async def close(self):
+        """Signal that nothing more is coming and wait until the queue is drained."""
+        self.queue.put_nowait(None)
+        await self.queue.join()
+
+    def status(self) -> str:
+        minutes = max((time.monotonic() - self.started) / 60, 1e-9)
+        return (
+            f"[Mail] queued {self.queue.qsize()}, sent {len(self.sent)} "
+            f"({len(self.sent) / minutes:.1f}/min), failed {len(self.failed)}, "
+            f"today {self.counter.count}/{self.daily_cap}"
+        )
+
+    def _maybe_status(self):
+        if time.monotonic() - self.last_status >= STATUS_EVERY:
+            self.last_status = time.monotonic()
+            print(self.status())
+
+    async def _next(self):
+        """Next item, printing status and keeping SMTP alive while the queue is empty."""
+        while True:
+            try:
+                return await asyncio.wait_for(self.queue.get(), STATUS_EVERY)
+            except asyncio.TimeoutError:
+                print(self.status())
+                await asyncio.to_thread(self.sender.keepalive)
+
+    async def _pace(self):
+        while True:
+            wait = self.bucket.wait_time(1, time.monotonic())
+            if wait <= 0:
+                self.bucket.take(1)
+                return
+            self._maybe_status()
+            await asyncio.sleep(min(wait, STATUS_EVERY))
+
+    async def run(self):
+        while True:
+            item = await self._next()
+            if item is None:
+                self.queue.task_done()
+                print(self.status())
+                return
+            label, fields = item
+            try:
+                if self.counter.count >= self.daily_cap:
+                    self.unsent.append(label)
+                    print(f"  ⏸️ {label}: daily cap of {self.daily_cap} reached, not sent")
+                    continue
+                await self._pace()
+                try:
+                    result = await asyncio.to_thread(self.send, **fields)
+                except Exception as e:
+                    self.failed.append(label)
+                    print(f"  ❌ Error on {label}: {e}")
+                    continue
+                if result is False:
+                    self.skipped.append(label)
+                    continue
+                self.counter.add()
+                self.sent.append(label)
+                print(f"  ✅ Sent {label} → {fields.get('to_address')} "
+                      f"({self.queue.qsize()} queued)")
+                self._maybe_status()
+            finally:
+                self.queue.task_done()
@@ -0,0 +1,194 @@
+# emailer/outbox.py
+"""
+Durable outbox: every rendered email is written to disk before it is sent,
+so an SMTP failure or a crash never throws away a letter that was paid for.
+
+    python -m emailer.outbox status
+    python -m emailer.outbox send [--per-minute 20]   # drain the spool
+    python -m emailer.outbox retry                     # move failed/ back to new/
+
+Maildir-style layout under OUTBOX_DIR: entries are written into tmp/ and
+renamed into new/ (so a half-written entry is never picked up), and move to
+sent/ or, after OUTBOX_MAX_ATTEMPTS failed attempts, to failed/. Each entry is
+a `.msg` file holding the message exactly as it goes over DATA (CRLF line
+endings, dot-stuffed) plus a `.json` file with its metadata and error log.
+
+Given a SendLedger, sent emails are recorded in it, and an entry the ledger
+shows as sent after it was spooled (just before a crash, say) is moved to
+sent/ without being sent again.
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import datetime
+from pathlib import Path
+
+from config.settings import OUTBOX_DIR, OUTBOX_MAX_ATTEMPTS, SMTP_PER_MINUTE, SMTP_DAILY_CAP
+from emailer.gmail_sender import GmailSender, render_application
+from emailer.mail_queue import MailQueue
+from emailer.send_ledger import SendLedger, ledger_key
+
+FOLDERS = ("tmp", "new", "sent", "failed")
+
+class Outbox:
+    def __init__(self, root: Path = OUTBOX_DIR, max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+                 ledger: SendLedger | None = None):
+        self.root         = Path(root)
+        self.max_attempts = max_attempts
+        self.ledger       = ledger
+        for folder in FOLDERS:
+            (self.root / folder).mkdir(parents=True, exist_ok=True)
+
+    def _path(self, folder: str, entry: str, suffix: str) -> Path:
+        return self.root / folder / f"{entry}{suffix}"
+
+    def add(self, label: str, from_address: str, to_address: str, subject: str,
+            body_text: str, attachment_path: str = None, url: str = None) -> str:
+        """Render the email and spool it atomically into new/. Returns the entry ID."""
+        entry = f"{time.time_ns()}.{uuid.uuid4().hex[:8]}"
+        meta  = {
+            "id": entry, "label": label, "from": from_address, "to": to_address,
+            "subject": subject, "url": url, "created": time.time(),
+            "attempts": 0, "errors": [],
+        }
+        data = b"".join(render_application(from_address, to_address, subject,
+                                           body_text, attachment_path))
+        for suffix, payload in ((".json", json.dumps(meta, ensure_ascii=False).encode("utf-8")),
+                                (".msg", data)):
+            tmp = self._path("tmp", entry, suffix)
+            with tmp.open("wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+        # Metadata first: an entry counts as spooled once its .msg is in new/
+        os.replace(self._path("tmp", entry, ".json"), self._path("new", entry, ".json"))
+        os.replace(self._path("tmp", entry, ".msg"), self._path("new", entry, ".msg"))
+        return entry
+
+    def meta(self, entry: str, folder: str = "new") -> dict:
+        return json.loads(self._path(folder, entry, ".json").read_text(encoding="utf-8"))
+
+    def _save_meta(self, folder: str, meta: dict):
+        path = self._path(folder, meta["id"], ".json")
+        tmp  = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _move(self, entry: str, src: str, dst: str):
+        os.replace(self._path(src, entry, ".msg"), self._path(dst, entry, ".msg"))
+        os.replace(self._path(src, entry, ".json"), self._path(dst, entry, ".json"))
+
+    def pending(self) -> list[str]:
+        """IDs of the entries in new/, oldest first."""
+        return sorted(p.stem for p in (self.root / "new").glob("*.msg"))
+
+    def pending_keys(self) -> set[tuple[str, str]]:
+        """(recipient, ad URL) of every pending entry."""
+        keys = set()
+        for entry in self.pending():
+            meta = self.meta(entry)
+            keys.add((meta["to"], meta.get("url")))
+        return keys
+
+    def deliver(self, entry: str, sender):
+        """
+        Send one pending entry with `sender` (a GmailSender) and move it to
+        sent/. On failure the error is logged in its metadata and it stays in
+        new/ for a later attempt, or moves to failed/ once out of attempts;
+        the error is re-raised either way. With a ledger, the send is
+        recorded in it, and an entry it shows as sent since it was spooled
+        is not sent again (returns False).
+        """
+        meta = self.meta(entry)
+        if self.ledger is not None:
+            sent_at = self.ledger.sent_at(ledger_key(meta["to"], meta.get("url"), meta["subject"]))
+            if sent_at and datetime.datetime.fromisoformat(sent_at).timestamp() >= int(meta["created"]):
+                print(f"  ⏭️ {meta['label']}: already sent to {meta['to']} on {sent_at[:10]}")
+                meta["skipped"] = sent_at
+                self._save_meta("new", meta)
+                self._move(entry, "new", "sent")
+                return False
+        data = self._path("new", entry, ".msg").read_bytes()
+        try:
+            sender.send_raw(meta["from"], meta["to"], data)
+        except Exception as e:
+            meta["attempts"] += 1
+            meta["errors"].append(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {e}")
+            self._save_meta("new", meta)
+            if meta["attempts"] >= self.max_attempts:
+                self._move(entry, "new", "failed")
+            raise
+        meta["attempts"] += 1
+        meta["sent"] = time.time()
+        if self.ledger is not None:
+            self.ledger.record(meta["to"], meta.get("url"), meta["subject"], meta["label"])
+        self._save_meta("new", meta)
+        self._move(entry, "new", "sent")
+
+    def retry_failed(self) -> int:
+        """Move every failed entry back to new/ with a fresh attempt count."""
+        moved = 0
+        for path in sorted((self.root / "failed").glob("*.msg")):
+            meta = self.meta(path.stem, "failed")
+            meta["attempts"] = 0
+            self._save_meta("failed", meta)
+            self._move(path.stem, "failed", "new")
+            moved += 1
+        return moved
+
+    def counts(self) -> dict[str, int]:
+        return {f: len(list((self.root / f).glob("*.msg"))) for f in FOLDERS if f != "tmp"}
+
+async def drain(outbox: Outbox, sender, entries: list[str] | None = None, **pacing):
+    """Send `entries` (default: all pending) through a paced MailQueue."""
+    mail = MailQueue(sender, send=lambda entry, **_: outbox.deliver(entry, sender), **pacing)
+    task = asyncio.create_task(mail.run())
+    for entry in outbox.pending() if entries is None else entries:
+        meta = outbox.meta(entry)
+        mail.put(meta["label"], entry=entry, to_address=meta["to"])
+    await mail.close()
+    await task
+    return mail
+
+def main():
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Inspect and drain the email outbox.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("status", help="count entries per folder")
+    send = sub.add_parser("send", help="send every pending entry")
+    send.add_argument("--per-minute", type=float, default=SMTP_PER_MINUTE)
+    send.add_argument("--daily-cap",  type=int,   default=SMTP_DAILY_CAP)
+    send.add_argument("--passes",     type=int,   default=3,
+                      help="rounds over entries that failed but have attempts left")
+    send.add_argument("--retry-delay", type=float, default=60.0,
+                      help="seconds between rounds")
+    sub.add_parser("retry", help="move failed entries back to the queue")
+    args = parser.parse_args()
+
+    outbox = Outbox(ledger=SendLedger() if args.cmd == "send" else None)
+    if args.cmd == "status":
+        print(", ".join(f"{folder}: {n}" for folder, n in outbox.counts().items()))
+    elif args.cmd == "retry":
+        print(f"Moved {outbox.retry_failed()} failed entries back to new/")
+    else:
+        load_dotenv()  # loads GMAIL_USER, GMAIL_APP_PASS
+        with GmailSender() as sender:
+            for n in range(args.passes):
+                if not outbox.pending():
+                    break
+                if n:
+                    print(f"Retrying {len(outbox.pending())} entries in {args.retry_delay:.0f}s…")
+                    time.sleep(args.retry_delay)
+                mail = asyncio.run(drain(outbox, sender, per_minute=args.per_minute,
+                                         daily_cap=args.daily_cap))
+                if mail.unsent:
+                    break
+        print(", ".join(f"{folder}: {n}" for folder, n in outbox.counts().items()))
+
+if __name__ == "__main__":
+    main()
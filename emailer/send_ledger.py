@@ -0,0 +1,166 @@
+# emailer/send_ledger.py
+"""
+Ledger of every application email sent, so re-running a day (or meeting the
+same ad again later) never emails an employer twice.
+
+    python -m emailer.send_ledger stats
+    python -m emailer.send_ledger find jobb@example.com
+    python -m emailer.send_ledger forget jobb@example.com [--url URL]
+    python -m emailer.send_ledger import-outbox        # record what outbox/sent/ holds
+
+An email is identified by (recipient, ad ID, subject hash): the recipient is
+case-folded, the ad ID is taken from the Platsbanken URL (or is the URL
+itself), and the subject is hashed so a re-posted ad under a new title counts
+as a new application. The key is the table's primary key, so a lookup is one
+index probe however many entries the ledger holds.
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import argparse
+import datetime
+import threading
+from pathlib import Path
+
+from config.settings import SEND_LEDGER_DB, OUTBOX_DIR
+from data.job_files  import ad_id_from_url
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sent (
+    recipient    TEXT NOT NULL,
+    ad           TEXT NOT NULL,   -- Platsbanken ad ID, else the URL ('' if none)
+    subject_hash TEXT NOT NULL,
+    subject      TEXT NOT NULL,
+    label        TEXT NOT NULL DEFAULT '',
+    sent_at      TEXT NOT NULL,   -- ISO timestamp
+    PRIMARY KEY (recipient, ad, subject_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sent_ad ON sent(ad) WHERE ad != '';
+"""
+
+def ledger_key(to_address: str, url: str | None, subject: str) -> tuple[str, str, str]:
+    """The (recipient, ad, subject hash) an email is recorded under."""
+    ad = ad_id_from_url(url) or (url or "").strip()
+    subject_hash = hashlib.sha256(subject.strip().encode("utf-8")).hexdigest()[:16]
+    return to_address.strip().casefold(), ad, subject_hash
+
+class SendLedger:
+    """
+    SQLite ledger of sent emails (WAL mode). Safe to share between the main
+    thread and the mail queue's worker threads.
+    """
+
+    def __init__(self, path: str = SEND_LEDGER_DB):
+        path = str(path)
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM sent").fetchone()[0]
+
+    def sent_at(self, key: tuple[str, str, str]) -> str | None:
+        """When the email with `key` was sent, or None if it never was."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT sent_at FROM sent WHERE recipient = ? AND ad = ? AND subject_hash = ?", key
+            ).fetchone()
+        return row[0] if row else None
+
+    def ad_sent_at(self, url: str) -> str | None:
+        """When an email about the ad at `url` was last sent, to anyone, or None."""
+        ad = ad_id_from_url(url) or (url or "").strip()
+        if not ad:
+            return None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT MAX(sent_at) FROM sent WHERE ad = ? AND ad != ''", (ad,)
+            ).fetchone()
+        return row[0]
+
+    def __contains__(self, key: tuple[str, str, str]) -> bool:
+        return self.sent_at(key) is not None
+
+    def record(self, to_address: str, url: str | None, subject: str,
+               label: str = "", sent_at: str | None = None):
+        """Record one sent email (a resend updates its time and label)."""
+        sent_at = sent_at or datetime.datetime.now().isoformat(timespec="seconds")
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sent VALUES (?, ?, ?, ?, ?, ?)",
+                (*ledger_key(to_address, url, subject), subject, label, sent_at),
+            )
+
+    def find(self, recipient: str) -> list[dict]:
+        """Everything sent to `recipient`, newest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM sent WHERE recipient = ? ORDER BY sent_at DESC",
+                (recipient.strip().casefold(),),
+            )
+            return [dict(r) for r in rows]
+
+    def forget(self, recipient: str, url: str | None = None) -> int:
+        """Drop the entries for `recipient` (only the ad at `url` if given) so they can be resent."""
+        sql, params = "DELETE FROM sent WHERE recipient = ?", [recipient.strip().casefold()]
+        if url:
+            sql += " AND ad = ?"
+            params.append(ad_id_from_url(url) or url.strip())
+        with self.lock, self.conn:
+            return self.conn.execute(sql, params).rowcount
+
+    def import_outbox(self, root: Path = OUTBOX_DIR) -> int:
+        """Record every email delivered from the outbox's sent/ folder. Returns the number."""
+        n = 0
+        for path in sorted((Path(root) / "sent").glob("*.json")):
+            meta = json.loads(path.read_text(encoding="utf-8"))
+            if "sent" not in meta:
+                continue   # skipped as already sent, so recorded already
+            self.record(meta["to"], meta.get("url"), meta["subject"], meta.get("label", ""),
+                        datetime.datetime.fromtimestamp(meta["sent"]).isoformat(timespec="seconds"))
+            n += 1
+        return n
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the ledger of sent applications.")
+    parser.add_argument("--db", default=str(SEND_LEDGER_DB))
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="number of emails recorded")
+    p = sub.add_parser("find", help="list what was sent to a recipient")
+    p.add_argument("recipient")
+    p = sub.add_parser("forget", help="allow a recipient (or one of their ads) to be emailed again")
+    p.add_argument("recipient")
+    p.add_argument("--url")
+    sub.add_parser("import-outbox", help="record the emails in the outbox's sent/ folder")
+    args = parser.parse_args()
+
+    with SendLedger(args.db) as ledger:
+        if args.cmd == "stats":
+            print(f"{len(ledger)} emails recorded in {args.db}")
+        elif args.cmd == "find":
+            for row in ledger.find(args.recipient):
+                print(f"{row['sent_at']}  {row['subject']}  (ad {row['ad'] or '-'})")
+        elif args.cmd == "forget":
+            print(f"Forgot {ledger.forget(args.recipient, args.url)} emails to {args.recipient}")
+        else:
+            print(f"Recorded {ledger.import_outbox()} sent emails from {OUTBOX_DIR}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# emailer/smtp_sink.py
+"""
+Local SMTP server that accepts and discards everything, for offline runs and
+benchmarks of the mail path.
+
+    python -m emailer.smtp_sink --port 8025 --connect-delay 0.3
+
+It speaks just enough ESMTP for smtplib: EHLO/HELO, AUTH PLAIN (any
+credentials), MAIL, RCPT, DATA, NOOP, RSET and QUIT. There is no STARTTLS, so
+point senders at it with `starttls=False`. `--connect-delay` and
+`--auth-delay` stand in for the TLS handshake and login a real server costs;
+`--max-per-connection` drops the connection after that many messages, the way
+Gmail ends long sessions, and `--refuse-data ADDR` answers DATA for that
+recipient with a 554 (the transaction stays open until RSET, so a second MAIL
+gets a 503 as on a real server).
+"""
+
+import time
+import argparse
+import threading
+import socketserver
+
+class SinkStats:
+    def __init__(self):
+        self.lock        = threading.Lock()
+        self.connections = 0
+        self.logins      = 0
+        self.messages    = 0
+        self.bytes       = 0
+
+    def add(self, **counts):
+        with self.lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+def make_handler(stats: SinkStats, connect_delay: float = 0.0, auth_delay: float = 0.0,
+                 max_per_connection: int = 0, refuse_data: set[str] = frozenset()):
+    class SinkHandler(socketserver.StreamRequestHandler):
+        def reply(self, line: str):
+            self.wfile.write(line.encode("ascii") + b"\r\n")
+
+        def handle(self):
+            stats.add(connections=1)
+            if connect_delay:
+                time.sleep(connect_delay)
+            self.reply("220 sink ESMTP ready")
+            sent  = 0
+            rcpts = None   # recipients of the open transaction, None outside one
+            while True:
+                raw = self.rfile.readline()
+                if not raw:
+                    return
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                verb = line.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    self.wfile.write(b"250-sink\r\n250-8BITMIME\r\n250-AUTH PLAIN\r\n250 SIZE 36700160\r\n")
+                elif verb == "HELO":
+                    self.reply("250 sink")
+                elif verb == "AUTH":
+                    if len(line.split()) == 2:   # credentials follow on the next line
+                        self.reply("334 ")
+                        self.rfile.readline()
+                    if auth_delay:
+                        time.sleep(auth_delay)
+                    stats.add(logins=1)
+                    self.reply("235 2.7.0 Accepted")
+                elif verb == "MAIL":
+                    if rcpts is not None:
+                        self.reply("503 5.5.1 Sender already specified")
+                        continue
+                    rcpts = []
+                    self.reply("250 OK")
+                elif verb == "RCPT":
+                    if rcpts is None:
+                        self.reply("503 5.5.1 Need MAIL command")
+                        continue
+                    rcpts.append(line.split(":", 1)[-1].strip().strip("<>"))
+                    self.reply("250 OK")
+                elif verb in ("RSET", "NOOP"):
+                    if verb == "RSET":
+                        rcpts = None
+                    self.reply("250 OK")
+                elif verb == "DATA":
+                    if not rcpts:
+                        self.reply("503 5.5.1 Need RCPT command")
+                        continue
+                    if refuse_data & set(rcpts):
+                        self.reply("554 5.7.1 Message refused")
+                        continue
+                    rcpts = None
+                    self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    size = 0
+                    while True:
+                        chunk = self.rfile.readline()
+                        if not chunk or chunk == b".\r\n":
+                            break
+                        size += len(chunk)
+                    stats.add(messages=1, bytes=size)
+                    self.reply("250 OK queued")
+                    sent += 1
+                    if max_per_connection and sent >= max_per_connection:
+                        return
+                elif verb == "QUIT":
+                    self.reply("221 Bye")
+                    return
+                else:
+                    self.reply("502 Command not implemented")
+
+    return SinkHandler
+
+class SinkServer(socketserver.ThreadingTCPServer):
+    daemon_threads      = True
+    allow_reuse_address = True
+
+def serve(port: int = 0, connect_delay: float = 0.0, auth_delay: float = 0.0,
+          max_per_connection: int = 0, refuse_data: set[str] = frozenset()):
+    """Start the sink in a background thread; its counters are on `server.stats`."""
+    stats  = SinkStats()
+    server = SinkServer(
+        ("127.0.0.1", port),
+        make_handler(stats, connect_delay, auth_delay, max_per_connection, set(refuse_data)),
+    )
+    server.stats = stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="SMTP sink for offline runs.")
+    parser.add_argument("--port",          type=int,   default=8025)
+    parser.add_argument("--connect-delay", type=float, default=0.0,
+                        help="seconds before the greeting (stands in for TLS setup)")
+    parser.add_argument("--auth-delay",    type=float, default=0.0,
+                        help="seconds each login takes")
+    parser.add_argument("--max-per-connection", type=int, default=0,
+                        help="close the connection after this many messages")
+    parser.add_argument("--refuse-data", action="append", default=[], metavar="ADDR",
+                        help="answer DATA for this recipient with a 554 (repeatable)")
+    args = parser.parse_args()
+
+    stats  = SinkStats()
+    server = SinkServer(("127.0.0.1", args.port),
+                        make_handler(stats, args.connect_delay, args.auth_delay,
+                                     args.max_per_connection, set(args.refuse_data)))
+    print(f"SMTP sink on 127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"{stats.messages} messages over {stats.connections} connections")
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,13 @@
 from dotenv import load_dotenv
 load_dotenv()  # loads OPENAI_API_KEY from .env
 
+import sys
 import yaml
 import openai
 from pathlib import Path
-from data.resume_utils import extract_resume_text
-from generators.cover_letter import generate_cover_letter
+from data.resume_utils import load_resume
+from data.job_files import read_job
+from generators.cover_letter import stream_cover_letter, timing_summary
 from config.settings import PERSONA_YAML, RESUME_PDF
 
 # 1) Load persona.yaml
@@ -17,11 +19,11 @@ if not persona_path.exists():
 with persona_path.open(encoding="utf-8") as f:
     persona = yaml.safe_load(f)
 
-# 2) Extract resume text
+# 2) Load the cleaned resume
 resume_path = Path(RESUME_PDF)
 if not resume_path.exists():
     raise RuntimeError(f"Resume PDF not found: {resume_path}")
-resume_text = extract_resume_text(str(resume_path))
+resume_text = load_resume(str(resume_path))
 
 # 3) Discover the latest date folder under output/raw/
 raw_root = Path("output") / "raw"
@@ -39,36 +41,17 @@ job_file = job_files[0]
 print(f"🔍 Testing with: {job_file}")
 
 # 5) Parse that job file
-def parse_job(path: str) -> dict:
-    lines = Path(path).read_text(encoding="utf-8").splitlines()
-    job = {}
-    for i, line in enumerate(lines):
-        if line.startswith("Title:"):
-            job["title"] = line.split("Title:",1)[1].strip()
-        elif line.startswith("Company:"):
-            job["company"] = line.split("Company:",1)[1].strip()
-        elif line.startswith("Location:"):
-            job["location"] = line.split("Location:",1)[1].strip()
-        elif line.startswith("Description:"):
-            desc = []
-            for dl in lines[i+1:]:
-                if dl.startswith("Contact Email:") or dl.startswith("URL:"):
-                    break
-                desc.append(dl)
-            job["description"] = "\n".join(desc).strip()
-        elif line.startswith("Contact Email:"):
-            job["email"] = line.split("Contact Email:",1)[1].strip()
-        elif line.startswith("URL:"):
-            job["url"] = line.split("URL:",1)[1].strip()
-    return job
+job = read_job(str(job_file))
 
-job = parse_job(str(job_file))
-
-# 6) Generate the cover letter via AI
+# 6) Stream the cover letter to the terminal and to output/letters/
+letter_path = Path("output") / "letters" / f"{job_file.stem}.txt"
+letter_path.parent.mkdir(parents=True, exist_ok=True)
 print("📝 Generating cover letter…")
-cover_letter = generate_cover_letter(persona, resume_text, job)
-
-# 7) Print it out
 print("\n—— Generated Cover Letter ——\n")
-print(cover_letter)
+with letter_path.open("w", encoding="utf-8") as f:
+    cover_letter = stream_cover_letter(persona, resume_text, job, outputs=(sys.stdout, f))
+
+# 7) Report
+print(f"\n💾 Saved to {letter_path}")
+print(f"⏱️  {timing_summary()}")
 
@@ -0,0 +1,150 @@
+# generators/batch.py
+"""
+Bulk letter generation through the OpenAI Batch API.
+
+One chat-completion request per job is written to a JSONL file, uploaded and
+submitted as a batch, polled until it finishes, and the results are fanned
+back out by `custom_id`. Batches cost half as much as live requests and don't
+count against the live rate limits, in exchange for up to 24 h turnaround.
+
+The batch ID is remembered next to the JSONL file, so re-running with the same
+jobs waits for the batch already in flight instead of submitting a new one.
+A batch that ended without completing is replaced by a fresh one, and the
+saved ID is dropped once the results are collected.
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+
+import openai
+
+from config.settings import BATCH_DIR
+from generators.cover_letter import completion_request, add_footer, letter_cache, record_usage
+
+ENDPOINT      = "/v1/chat/completions"
+POLL_INTERVAL = 30.0   # seconds between status checks
+DONE_STATES   = {"completed", "failed", "expired", "cancelled"}
+
+def custom_id(idx: int) -> str:
+    return f"job-{idx:04d}"
+
+def write_batch_file(requests: dict[str, dict], path: Path) -> Path:
+    """Write the chat-completion `requests` ({custom_id: body}) to the JSONL file at `path`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for cid, body in requests.items():
+            f.write(json.dumps({
+                "custom_id": cid,
+                "method":    "POST",
+                "url":       ENDPOINT,
+                "body":      body,
+            }, ensure_ascii=False) + "\n")
+    return path
+
+def submit_batch(client: openai.OpenAI, path: Path) -> str:
+    """Upload the JSONL file and start a batch over it. Returns the batch ID."""
+    with path.open("rb") as f:
+        upload = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=upload.id,
+        endpoint=ENDPOINT,
+        completion_window="24h",
+    )
+    return batch.id
+
+def wait_for_batch(client: openai.OpenAI, batch_id: str,
+                   poll_interval: float = POLL_INTERVAL):
+    """Poll until the batch reaches a final state and return it."""
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        done = f"{counts.completed}/{counts.total}" if counts else "?"
+        print(f"[Batch] {batch_id}: {batch.status} ({done} done)")
+        if batch.status in DONE_STATES:
+            return batch
+        time.sleep(poll_interval)
+
+def collect_results(client: openai.OpenAI, batch) -> dict:
+    """{custom_id: letter without footer, or an Exception for failed requests}."""
+    results = {}
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            row  = json.loads(line)
+            resp = row.get("response") or {}
+            if row.get("error") or resp.get("status_code") != 200:
+                results[row["custom_id"]] = RuntimeError(
+                    row.get("error") or resp.get("body", {}).get("error")
+                )
+                continue
+            record_usage(resp["body"].get("usage"))
+            results[row["custom_id"]] = resp["body"]["choices"][0]["message"]["content"].strip()
+    if batch.error_file_id:
+        for line in client.files.content(batch.error_file_id).text.splitlines():
+            if line.strip():
+                row = json.loads(line)
+                results[row["custom_id"]] = RuntimeError(row.get("error"))
+    return results
+
+def generate_cover_letters_batch(persona: dict, resume: str, jobs: list[dict],
+                                 name: str = "letters", base_url: str | None = None,
+                                 poll_interval: float = POLL_INTERVAL,
+                                 force: bool = False) -> list:
+    """
+    Generate letters for `jobs` via the Batch API. Like
+    `generate_cover_letters`, results come back in job order with an
+    exception in place of any letter that failed. Only jobs missing from the
+    letter cache (all of them with `force`) are sent in the batch.
+    """
+    cache    = letter_cache()
+    requests = {custom_id(idx): completion_request(persona, resume, job)
+                for idx, job in enumerate(jobs)}
+    letters  = {}
+    if not force:
+        for cid, request in requests.items():
+            cached = cache.get(request)
+            if cached is not None:
+                letters[cid] = cached
+    pending = {cid: r for cid, r in requests.items() if cid not in letters}
+    if pending:
+        letters.update(_run_batch(pending, name, base_url, poll_interval))
+        for cid in pending:
+            if isinstance(letters.get(cid), str):
+                cache.put(pending[cid], letters[cid])
+
+    missing = RuntimeError("batch finished without a result")
+    return [
+        add_footer(l) if isinstance(l, str) else l
+        for l in (letters.get(custom_id(idx), missing) for idx in range(len(jobs)))
+    ]
+
+def _run_batch(requests: dict[str, dict], name: str, base_url: str | None,
+               poll_interval: float) -> dict:
+    client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=base_url)
+    path   = write_batch_file(requests, Path(BATCH_DIR) / f"{name}.jsonl")
+    state  = path.with_suffix(".batch.json")
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+
+    batch_id = None
+    if state.exists():
+        saved = json.loads(state.read_text(encoding="utf-8"))
+        if saved.get("input_sha256") == digest:
+            status = client.batches.retrieve(saved["batch_id"]).status
+            if status in DONE_STATES and status != "completed":
+                print(f"[Batch] {saved['batch_id']} ended {status}; submitting a new batch")
+            else:
+                batch_id = saved["batch_id"]
+                print(f"[Batch] Resuming {batch_id}")
+    if batch_id is None:
+        batch_id = submit_batch(client, path)
+        state.write_text(json.dumps({"batch_id": batch_id, "input_sha256": digest}))
+        print(f"[Batch] Submitted {batch_id} with {len(requests)} requests")
+
+    batch   = wait_for_batch(client, batch_id, poll_interval)
+    results = collect_results(client, batch)
+    state.unlink(missing_ok=True)   # letters are in the cache now; a rerun starts afresh
+    return results
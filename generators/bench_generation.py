@@ -0,0 +1,83 @@
+# generators/bench_generation.py
+"""
+Time serial vs concurrent letter generation against the fake OpenAI endpoint.
+
+    python -m generators.bench_generation --jobs 40 --latency 0.5 --concurrency 8
+    python -m generators.bench_generation --skip-serial --rpm 120 --tpm 60000 --error-rate 0.1
+
+With --rpm/--tpm/--error-rate the fake server enforces rate limits and injects
+500s, to check the client paces itself and retries instead of dropping letters.
+"""
+
+import io
+import os
+import time
+import argparse
+import contextlib
+
+import openai
+
+from generators import fake_openai
+from generators.cover_letter import generate_cover_letter, generate_cover_letters
+from generators.rate_limit import RateLimiter
+
+PERSONA = {
+    "name": "Test Person", "headline": "Developer",
+    "summary": "Builds things.", "skills": ["Python", "SQL"],
+}
+RESUME = "Experience: five years of Python.\n" * 40
+
+def sample_jobs(n: int) -> list[dict]:
+    return [{
+        "title": f"Developer {i}", "company": f"Company {i}", "location": "Stockholm",
+        "description": "We are looking for a developer who knows Python and SQL. " * 20,
+        "url": f"https://example.com/platsbanken/annonser/{i}",
+    } for i in range(n)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs",        type=int,   default=40)
+    parser.add_argument("--latency",     type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int,   default=8)
+    parser.add_argument("--skip-serial", action="store_true")
+    parser.add_argument("--rpm",         type=int)
+    parser.add_argument("--tpm",         type=int)
+    parser.add_argument("--error-rate",  type=float, default=0.0)
+    args = parser.parse_args()
+
+    limits = fake_openai.ServerLimits(args.rpm, args.tpm)
+    server = fake_openai.serve(latency=args.latency, limits=limits, error_rate=args.error_rate)
+    url    = fake_openai.base_url(server)
+    os.environ.setdefault("OPENAI_API_KEY", "test")
+    openai.api_key  = os.environ["OPENAI_API_KEY"]
+    openai.base_url = url
+    jobs = sample_jobs(args.jobs)
+
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    if not args.skip_serial:
+        t0 = time.perf_counter()
+        with quiet:
+            for job in jobs:
+                generate_cover_letter(PERSONA, RESUME, job, force=True)
+        serial = time.perf_counter() - t0
+        print(f"serial:      {serial:6.2f} s  ({args.jobs / serial:5.1f} letters/s)")
+
+    quiet   = contextlib.redirect_stdout(io.StringIO())
+    limiter = RateLimiter()
+    limits.limited = 0
+    t0 = time.perf_counter()
+    with quiet:
+        letters = generate_cover_letters(
+            PERSONA, RESUME, jobs, concurrency=args.concurrency, base_url=url,
+            force=True, limiter=limiter,
+        )
+    conc   = time.perf_counter() - t0
+    errors = sum(isinstance(l, Exception) for l in letters)
+    print(f"concurrent:  {conc:6.2f} s  ({args.jobs / conc:5.1f} letters/s, "
+          f"concurrency {args.concurrency}, {errors} errors)")
+    print(f"rate limit:  {limits.limited} 429s from the server, {limiter.summary()}")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# generators/bench_language.py
+"""
+Compare `detect_language` with langdetect on scraped job descriptions.
+
+    python -m generators.bench_language                 # every job in the job store
+    python -m generators.bench_language output/raw/D    # the job files in a scrape folder
+
+Reports the time each detector needs for the whole corpus and how often they
+agree (langdetect codes other than sv count as English, as they used to), then
+how each does on SHORT_ADS, short labelled ads with few or no function words.
+"""
+
+import time
+import argparse
+from pathlib import Path
+
+from generators import language
+from generators.language import detect_language
+
+# (text, language): short ads the corpus may lack, where stopword counts tie
+SHORT_ADS = [
+    ("Senior Backend Engineer (Python/Go)\nStockholm, hybrid", "en"),
+    ("Requirements\n- Python\n- Docker\n- Kubernetes", "en"),
+    ("Frontend Developer – React/TypeScript\nRemote", "en"),
+    ("Undersköterska till hemtjänst, Göteborg", "sv"),
+    ("Lärare i matematik\nHeltid, tillsvidare", "sv"),
+    ("Lagerarbetare sökes – truckkort krävs", "sv"),
+]
+
+def langdetect_code(detect, text: str) -> str:
+    try:
+        return "sv" if detect(text).startswith("sv") else "en"
+    except Exception:
+        return "sv"
+
+def load_descriptions(folder: str | None) -> list[str]:
+    if folder:
+        from data.job_files import read_job
+        return [read_job(p)["description"] for p in sorted(Path(folder).glob("*.txt"))]
+    from data.job_store import JobStore
+    with JobStore() as store:
+        return [job["description"] for job in store.search()]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("folder", nargs="?", help="scrape folder (default: the job store)")
+    args = parser.parse_args()
+
+    from langdetect import detect, DetectorFactory
+    DetectorFactory.seed = 0
+
+    texts = [t for t in load_descriptions(args.folder) if t.strip()]
+    if not texts:
+        raise SystemExit("No job descriptions found")
+
+    t0 = time.perf_counter()
+    theirs = [langdetect_code(detect, text) for text in texts]
+    t_langdetect = time.perf_counter() - t0
+
+    language._memo.clear()
+    t0 = time.perf_counter()
+    ours = [detect_language(t) for t in texts]
+    t_ours = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for t in texts:
+        detect_language(t)
+    t_memo = time.perf_counter() - t0
+
+    agree = sum(a == b for a, b in zip(ours, theirs))
+    print(f"Corpus:          {len(texts)} descriptions "
+          f"({ours.count('sv')} sv / {ours.count('en')} en by detect_language)")
+    print(f"langdetect:      {t_langdetect:.3f}s ({1000 * t_langdetect / len(texts):.2f} ms/job, incl. profile load)")
+    print(f"detect_language: {t_ours:.3f}s ({1000 * t_ours / len(texts):.3f} ms/job)")
+    print(f"  memoised:      {t_memo:.4f}s")
+    print(f"Agreement:       {agree}/{len(texts)} ({100 * agree / len(texts):.1f}%)")
+    for text, a, b in zip(texts, ours, theirs):
+        if a != b:
+            print(f"  differ (ours={a}, langdetect={b}): {text[:80]!r}")
+
+    ours   = sum(detect_language(t) == lang for t, lang in SHORT_ADS)
+    theirs = sum(langdetect_code(detect, t) == lang for t, lang in SHORT_ADS)
+    print(f"Short ads:       detect_language {ours}/{len(SHORT_ADS)}, "
+          f"langdetect {theirs}/{len(SHORT_ADS)} correct")
+    for text, lang in SHORT_ADS:
+        if detect_language(text) != lang:
+            print(f"  wrong (ours, expected {lang}): {text[:80]!r}")
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,136 @@
 
 import os
+import sys
+import time
+import asyncio
+import httpx
 import openai
-from langdetect import detect
 from config.settings import (
     AI_TONE, LETTER_LANG,
     OPENAI_MODEL, OPENAI_TEMPERATURE, OPENAI_MAX_TOKENS,
+    OPENAI_CONCURRENCY, OPENAI_TIMEOUT,
     PERSONAL_WEBSITE, GITHUB_URL, BOT_NOTE
 )
+from generators.letter_cache import LetterCache
+from generators.language import detect_language
+from generators.rate_limit import RateLimiter, request_tokens
+from generators.job_trim import trim_description
+from data.resume_utils import estimate_tokens
 
 # ensure your OPENAI_API_KEY is in the environment
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+_letter_cache = None
+
+def letter_cache() -> LetterCache:
+    """The shared on-disk letter cache, opened on first use."""
+    global _letter_cache
+    if _letter_cache is None:
+        _letter_cache = LetterCache()
+    return _letter_cache
+
 def decide_language(description: str) -> str:
     if LETTER_LANG == "auto":
-        code = detect(description)
-        return "Swedish" if code.startswith("sv") else "English"
+        return "Swedish" if detect_language(description) == "sv" else "English"
     return "Swedish" if LETTER_LANG == "sv" else "English"
 
-def make_prompt(persona: dict, resume: str, job: dict) -> str:
-    lang = decide_language(job["description"])
-    print(f"🗣️  Generating a {lang}-language letter in a {AI_TONE} tone")
-
+def make_system_prompt(persona: dict, resume: str) -> str:
+    """
+    Everything that is the same for every job: instructions, resume and persona.
+    Kept byte-identical across jobs so the provider can cache it as a prefix.
+    """
     # Flatten persona
     ptxt = f"{persona['name']}, {persona['headline']}\n\n"
     ptxt += persona.get("summary", "") + "\n\n"
     ptxt += "Skills: " + ", ".join(persona.get("skills", [])) + "\n\n"
 
     return f"""\
-You are a cover‐letter assistant. Write a {AI_TONE}, {lang}-language cover letter in first person (4 paragraphs),
-using the candidate’s background and the job details provided below.
+You are a cover‐letter assistant. Write {AI_TONE} cover letters in first person (4 paragraphs),
+using the candidate’s background below and the job details the user provides.
+Begin each letter with “Dear Hiring Team,” and end the main body with the candidate’s name.
 
 --- Candidate Resume ---
 {resume}
 
 --- Candidate Persona ---
-{ptxt}
+{ptxt}"""
+
+def make_prompt(job: dict) -> str:
+    """The small per-job part of the prompt: language and the job opening."""
+    lang = decide_language(job["description"])
+    print(f"🗣️  Generating a {lang}-language letter in a {AI_TONE} tone")
+
+    description = trim_description(job["description"])
+    before, after = estimate_tokens(job["description"]), estimate_tokens(description)
+    if after < before:
+        print(f"✂️  Description trimmed from ~{before} to ~{after} tokens")
+
+    return f"""\
+Write the cover letter in {lang}.
 
 --- Job Opening ---
 Title: {job['title']}
 Company: {job['company']}
 Location: {job['location']}
 Description:
-{job['description']}
+{description}
 URL: {job['url']}
-
-Begin the letter with “Dear Hiring Team,” and end the main body with your name.
 """
 
-def generate_cover_letter(persona: dict, resume: str, job: dict) -> str:
-    """Generate a cover letter and append your personal footer."""
-    prompt = make_prompt(persona, resume, job)
-    resp = openai.chat.completions.create(
-        model=OPENAI_MODEL,
-        messages=[{"role":"user","content":prompt}],
-        temperature=OPENAI_TEMPERATURE,
-        max_tokens=OPENAI_MAX_TOKENS
+def completion_request(persona: dict, resume: str, job: dict) -> dict:
+    """Chat-completion parameters for one job's letter."""
+    return {
+        "model":       OPENAI_MODEL,
+        "messages":    [
+            {"role":"system","content":make_system_prompt(persona, resume)},
+            {"role":"user","content":make_prompt(job)},
+        ],
+        "temperature": OPENAI_TEMPERATURE,
+        "max_tokens":  OPENAI_MAX_TOKENS,
+    }
+
+# Token usage of this run, to check the static prefix is being cached
+token_usage = {"requests": 0, "prompt": 0, "cached": 0, "completion": 0}
+
+def record_usage(usage):
+    """Add a response's `usage` (API object or plain dict) to `token_usage`."""
+    if usage is None:
+        return
+    if not isinstance(usage, dict):
+        usage = usage.model_dump()
+    details = usage.get("prompt_tokens_details") or {}
+    token_usage["requests"]   += 1
+    token_usage["prompt"]     += usage.get("prompt_tokens") or 0
+    token_usage["cached"]     += details.get("cached_tokens") or 0
+    token_usage["completion"] += usage.get("completion_tokens") or 0
+
+def usage_summary() -> str:
+    u = token_usage
+    share = f"{100 * u['cached'] / u['prompt']:.0f}%" if u["prompt"] else "n/a"
+    return (
+        f"{u['requests']} API calls, {u['prompt']} prompt tokens "
+        f"({u['cached']} cached, {share}), {u['completion']} completion tokens"
     )
-    letter = resp.choices[0].message.content.strip()
 
-    # Manually append the guaranteed footer
+# Streaming latency per generated letter: time to first token and in total
+letter_timings = []
+
+def record_timing(ttft: float | None, total: float):
+    letter_timings.append({"ttft": ttft, "total": total})
+
+def timing_summary() -> str:
+    ttfts  = [t["ttft"] for t in letter_timings if t["ttft"] is not None]
+    totals = [t["total"] for t in letter_timings]
+    if not totals:
+        return "no streamed letters"
+    ttft = f"{sum(ttfts) / len(ttfts):.2f}s" if ttfts else "n/a"
+    return (
+        f"{len(totals)} streamed letters, avg first token {ttft}, "
+        f"avg total {sum(totals) / len(totals):.2f}s, max total {max(totals):.2f}s"
+    )
+
+def add_footer(letter: str) -> str:
+    """Manually append the guaranteed footer."""
     footer = (
         "\n\n---\n"
         f"Please feel free to check out my work:\n"
@@ -68,3 +140,148 @@ def generate_cover_letter(persona: dict, resume: str, job: dict) -> str:
     )
     return letter + footer
 
+def generate_cover_letter(persona: dict, resume: str, job: dict, force: bool = False) -> str:
+    """
+    Generate a cover letter and append your personal footer. An identical
+    earlier request is answered from the letter cache unless `force` is set.
+    """
+    request = completion_request(persona, resume, job)
+    cache   = letter_cache()
+    letter  = None if force else cache.get(request)
+    if letter is None:
+        resp = openai.chat.completions.create(**request)
+        record_usage(resp.usage)
+        letter = resp.choices[0].message.content.strip()
+        cache.put(request, letter)
+    return add_footer(letter)
+
+def stream_cover_letter(persona: dict, resume: str, job: dict,
+                        outputs=(sys.stdout,), force: bool = False) -> str:
+    """
+    Like `generate_cover_letter`, but writes the letter to each of `outputs`
+    (text streams) as the tokens arrive, then the footer. Returns the same
+    letter + footer string and records the latency in `letter_timings`.
+    """
+    def emit(text):
+        for out in outputs:
+            out.write(text)
+            out.flush()
+
+    request = completion_request(persona, resume, job)
+    cache   = letter_cache()
+    letter  = None if force else cache.get(request)
+    if letter is not None:
+        emit(letter)
+    else:
+        start, ttft, parts = time.perf_counter(), None, []
+        stream = openai.chat.completions.create(
+            **request, stream=True, stream_options={"include_usage": True},
+        )
+        for chunk in stream:
+            if chunk.usage:
+                record_usage(chunk.usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                parts.append(delta)
+                emit(delta)
+        record_timing(ttft, time.perf_counter() - start)
+        letter = "".join(parts).strip()
+        cache.put(request, letter)
+    emit(add_footer("") + "\n")
+    return add_footer(letter)
+
+async def _create_streamed(client: openai.AsyncOpenAI, limiter: RateLimiter,
+                           request: dict, label: str) -> str:
+    """Stream one completion, logging when it starts producing and when it ends."""
+    start, ttft, parts = time.perf_counter(), None, []
+    stream = await limiter.call(
+        lambda: client.chat.completions.with_raw_response.create(
+            **request, stream=True, stream_options={"include_usage": True},
+        ),
+        request_tokens(request),
+    )
+    async for chunk in stream:
+        if chunk.usage:
+            record_usage(chunk.usage)
+        if chunk.choices and chunk.choices[0].delta.content:
+            if ttft is None:
+                ttft = time.perf_counter() - start
+                print(f"[Stream] {label}: first token after {ttft:.2f}s")
+            parts.append(chunk.choices[0].delta.content)
+    total  = time.perf_counter() - start
+    letter = "".join(parts).strip()
+    record_timing(ttft, total)
+    print(f"[Stream] {label}: {len(letter)} chars in {total:.2f}s")
+    return letter
+
+async def _generate_async(client: openai.AsyncOpenAI, sem: asyncio.Semaphore,
+                          limiter: RateLimiter, persona: dict, resume: str,
+                          job: dict, force: bool, stream: bool = False) -> str:
+    request = completion_request(persona, resume, job)
+    cache   = letter_cache()
+    letter  = None if force else cache.get(request)
+    if letter is None:
+        async with sem:
+            if stream:
+                letter = await _create_streamed(client, limiter, request, job["title"])
+            else:
+                resp = await limiter.call(
+                    lambda: client.chat.completions.with_raw_response.create(**request),
+                    request_tokens(request),
+                )
+                record_usage(resp.usage)
+                letter = resp.choices[0].message.content.strip()
+        cache.put(request, letter)
+    return add_footer(letter)
+
+async def generate_cover_letters_async(persona: dict, resume: str, jobs: list[dict],
+                                       concurrency: int = OPENAI_CONCURRENCY,
+                                       timeout: float = OPENAI_TIMEOUT,
+                                       base_url: str | None = None,
+                                       force: bool = False,
+                                       stream: bool = False,
+                                       limiter: RateLimiter | None = None,
+                                       on_letter=None) -> list:
+    """
+    Generate letters for all `jobs` with at most `concurrency` requests in flight,
+    sharing one pooled HTTP client. Results come back in job order; a job whose
+    request failed gets its exception in place of the letter. Cached letters
+    are reused unless `force` is set. With `stream`, responses are streamed and
+    each letter's first token and completion are logged as they happen.
+
+    Requests are paced by `limiter` (a fresh `RateLimiter` by default), which
+    follows the account's rate-limit headers and retries 429s and 5xx.
+    `on_letter(index, letter or exception)` is called as each job finishes.
+    """
+    limiter = limiter or RateLimiter()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as http_client:
+        client = openai.AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=base_url,
+            http_client=http_client,
+            timeout=timeout,
+            max_retries=0,   # retries are the limiter's job
+        )
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(idx, job):
+            try:
+                letter = await _generate_async(client, sem, limiter, persona, resume,
+                                               job, force, stream)
+            except Exception as e:
+                letter = e
+            if on_letter:
+                on_letter(idx, letter)
+            return letter
+
+        return await asyncio.gather(*(one(idx, job) for idx, job in enumerate(jobs)))
+
+def generate_cover_letters(persona: dict, resume: str, jobs: list[dict], **kwargs) -> list:
+    """Blocking wrapper around `generate_cover_letters_async`."""
+    return asyncio.run(generate_cover_letters_async(persona, resume, jobs, **kwargs))
+
@@ -0,0 +1,349 @@
+# generators/fake_openai.py
+"""
+Local stand-in for the OpenAI chat-completions endpoint, for offline runs and
+benchmarks.
+
+    python -m generators.fake_openai --port 8808 --latency 1.0
+    OPENAI_BASE_URL=http://127.0.0.1:8808/v1 OPENAI_API_KEY=test python send_applications.py
+
+Every request sleeps `--latency` seconds and answers with a canned letter;
+streamed requests (`"stream": true`) get the first chunk after a fifth of that
+and the rest spread over the remainder.
+
+With `--rpm`/`--tpm` the server enforces per-minute budgets like the real API:
+responses carry `x-ratelimit-*` headers and over-budget requests get a 429.
+`--error-rate` answers that share of requests with a 500.
+The file-upload and batch endpoints are emulated in memory too; a batch
+completes `--batch-delay` seconds after it is created.
+"""
+
+import json
+import random
+import time
+import uuid
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from generators.rate_limit import request_tokens
+
+FAKE_LETTER = (
+    "Dear Hiring Team,\n\n"
+    "I am writing to apply for this position. "
+    "My background fits the role well.\n\n"
+    "Best regards,\nThe Candidate"
+)
+
+# Like the real prefix cache: only prefixes of at least this many tokens count
+MIN_CACHED_PREFIX = 1024
+
+class PrefixCache:
+    """Remembers system messages, so repeats report them as cached tokens."""
+
+    def __init__(self):
+        self.seen = set()
+        self.lock = threading.Lock()
+
+    def cached_tokens(self, body: dict) -> int:
+        messages = body.get("messages", [])
+        if not messages or messages[0].get("role") != "system":
+            return 0
+        prefix = messages[0].get("content") or ""
+        tokens = len(prefix) // 4
+        if tokens < MIN_CACHED_PREFIX:
+            return 0
+        with self.lock:
+            hit = prefix in self.seen
+            self.seen.add(prefix)
+        return tokens if hit else 0
+
+class ServerLimits:
+    """Per-minute request/token buckets reported the way the OpenAI API does."""
+
+    def __init__(self, rpm: int | None = None, tpm: int | None = None):
+        self.limits  = {"requests": rpm, "tokens": tpm}
+        self.levels  = {k: float(v or 0) for k, v in self.limits.items()}
+        self.updated = time.monotonic()
+        self.lock    = threading.Lock()
+        self.limited = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        for kind, limit in self.limits.items():
+            if limit:
+                self.levels[kind] = min(limit, self.levels[kind] + (now - self.updated) * limit / 60)
+        self.updated = now
+
+    def admit(self, tokens: int) -> tuple[bool, dict]:
+        """Spend budget for one request of `tokens` tokens. Returns (allowed, headers)."""
+        with self.lock:
+            self._refill()
+            cost = {"requests": 1, "tokens": tokens}
+            allowed = all(
+                not limit or self.levels[kind] >= cost[kind]
+                for kind, limit in self.limits.items()
+            )
+            if allowed:
+                for kind, limit in self.limits.items():
+                    if limit:
+                        self.levels[kind] -= cost[kind]
+            else:
+                self.limited += 1
+            headers = {}
+            for kind, limit in self.limits.items():
+                if not limit:
+                    continue
+                level = max(0, self.levels[kind])
+                headers[f"x-ratelimit-limit-{kind}"]     = str(limit)
+                headers[f"x-ratelimit-remaining-{kind}"] = str(int(level))
+                headers[f"x-ratelimit-reset-{kind}"]     = f"{(limit - level) * 60 / limit:.3f}s"
+            return allowed, headers
+
+def completion(body: dict, cached_tokens: int = 0) -> dict:
+    prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+    prompt_tokens = prompt_chars // 4
+    completion_tokens = len(FAKE_LETTER) // 4
+    return {
+        "id":      "chatcmpl-fake",
+        "object":  "chat.completion",
+        "created": int(time.time()),
+        "model":   body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": FAKE_LETTER},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens":     prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens":      prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        },
+    }
+
+def _multipart_file(content_type: str, raw: bytes) -> bytes:
+    """Contents of the `file` field of a multipart/form-data upload."""
+    msg = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + raw
+    )
+    for part in msg.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True)
+    return b""
+
+class BatchState:
+    """In-memory files and batches for the emulated Batch API."""
+
+    def __init__(self, delay: float):
+        self.delay   = delay
+        self.files   = {}
+        self.batches = {}
+        self.lock    = threading.Lock()
+
+    def add_file(self, data: bytes) -> str:
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        with self.lock:
+            self.files[file_id] = data
+        return file_id
+
+    def create(self, body: dict) -> dict:
+        batch = {
+            "id":                f"batch_{uuid.uuid4().hex[:12]}",
+            "object":            "batch",
+            "endpoint":          body["endpoint"],
+            "input_file_id":     body["input_file_id"],
+            "completion_window": body.get("completion_window", "24h"),
+            "status":            "in_progress",
+            "created_at":        int(time.time()),
+            "output_file_id":    None,
+            "error_file_id":     None,
+            "request_counts":    {"total": 0, "completed": 0, "failed": 0},
+        }
+        with self.lock:
+            lines = self.files[body["input_file_id"]].decode("utf-8").splitlines()
+            batch["request_counts"]["total"] = len([l for l in lines if l.strip()])
+            self.batches[batch["id"]] = batch
+        return batch
+
+    def get(self, batch_id: str) -> dict | None:
+        with self.lock:
+            batch = self.batches.get(batch_id)
+            if batch and batch["status"] == "in_progress" \
+                    and time.time() - batch["created_at"] >= self.delay:
+                self._finish(batch)
+            return batch
+
+    def _finish(self, batch: dict):
+        out = []
+        for line in self.files[batch["input_file_id"]].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            req = json.loads(line)
+            out.append(json.dumps({
+                "id":        f"batch_req_{uuid.uuid4().hex[:8]}",
+                "custom_id": req["custom_id"],
+                "response":  {"status_code": 200, "request_id": "fake",
+                              "body": completion(req["body"])},
+                "error":     None,
+            }))
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        self.files[file_id] = ("\n".join(out) + "\n").encode("utf-8")
+        batch.update({
+            "status":         "completed",
+            "output_file_id": file_id,
+            "completed_at":   int(time.time()),
+            "request_counts": {"total": len(out), "completed": len(out), "failed": 0},
+        })
+
+def make_handler(latency: float = 0.0, batch_delay: float = 2.0,
+                 limits: ServerLimits | None = None, error_rate: float = 0.0):
+    batches  = BatchState(batch_delay)
+    prefixes = PrefixCache()
+    limits   = limits or ServerLimits()
+
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            raw    = self.rfile.read(length)
+            path   = self.path.rstrip("/")
+            if path.endswith("/chat/completions"):
+                body = json.loads(raw or b"{}")
+                allowed, headers = limits.admit(request_tokens(body))
+                if not allowed:
+                    return self._json({"error": {
+                        "message": "Rate limit reached", "type": "requests",
+                        "code": "rate_limit_exceeded",
+                    }}, 429, headers)
+                if random.random() < error_rate:
+                    return self._json({"error": {
+                        "message": "The server had an error", "type": "server_error",
+                    }}, 500, headers)
+                if body.get("stream"):
+                    return self._stream(body, prefixes.cached_tokens(body), headers)
+                if latency:
+                    time.sleep(latency)
+                return self._json(completion(body, prefixes.cached_tokens(body)), headers=headers)
+            if path.endswith("/files"):
+                data    = _multipart_file(self.headers["Content-Type"], raw)
+                file_id = batches.add_file(data)
+                return self._json({
+                    "id": file_id, "object": "file", "bytes": len(data),
+                    "created_at": int(time.time()), "filename": "batch.jsonl",
+                    "purpose": "batch", "status": "processed",
+                })
+            if path.endswith("/batches"):
+                return self._json(batches.create(json.loads(raw)))
+            self._json({"error": {"message": f"Unknown path {self.path}"}}, 404)
+
+        def do_GET(self):
+            parts = self.path.rstrip("/").split("/")
+            if len(parts) >= 2 and parts[-2] == "batches":
+                batch = batches.get(parts[-1])
+                if batch:
+                    return self._json(batch)
+            if len(parts) >= 3 and parts[-1] == "content" and parts[-3] == "files":
+                data = batches.files.get(parts[-2])
+                if data is not None:
+                    return self._raw(data, "application/jsonl")
+            self._json({"error": {"message": f"Unknown path {self.path}"}}, 404)
+
+        def _stream(self, body: dict, cached_tokens: int, headers: dict):
+            """Server-sent chat.completion.chunk events, one per word of the letter."""
+            full   = completion(body, cached_tokens)
+            words  = FAKE_LETTER.split(" ")
+            pieces = [w if i == 0 else " " + w for i, w in enumerate(words)]
+            base   = {"id": full["id"], "object": "chat.completion.chunk",
+                      "created": full["created"], "model": full["model"]}
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+
+            def event(payload):
+                data = f"data: {payload}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            time.sleep(latency / 5)
+            for piece in pieces:
+                event(json.dumps({**base, "choices": [{
+                    "index": 0, "delta": {"content": piece}, "finish_reason": None,
+                }]}))
+                time.sleep(latency * 4 / 5 / len(pieces))
+            event(json.dumps({**base, "choices": [{
+                "index": 0, "delta": {}, "finish_reason": "stop",
+            }]}))
+            if (body.get("stream_options") or {}).get("include_usage"):
+                event(json.dumps({**base, "choices": [], "usage": full["usage"]}))
+            event("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _raw(self, data: bytes, content_type: str):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _json(self, payload: dict, status: int = 200, headers: dict | None = None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return FakeOpenAIHandler
+
+def serve(port: int = 0, latency: float = 0.0, batch_delay: float = 2.0,
+          limits: ServerLimits | None = None, error_rate: float = 0.0):
+    """Start the fake endpoint in a background thread (see `base_url`)."""
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", port), make_handler(latency, batch_delay, limits, error_rate)
+    )
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def base_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}/v1/"
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI endpoint for offline runs.")
+    parser.add_argument("--port",    type=int,   default=8808)
+    parser.add_argument("--latency", type=float, default=1.0,
+                        help="seconds each completion takes")
+    parser.add_argument("--batch-delay", type=float, default=10.0,
+                        help="seconds until a submitted batch completes")
+    parser.add_argument("--rpm", type=int, help="requests per minute before 429s")
+    parser.add_argument("--tpm", type=int, help="tokens per minute before 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="share of completions answered with a 500")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", args.port),
+        make_handler(args.latency, args.batch_delay,
+                     ServerLimits(args.rpm, args.tpm), args.error_rate),
+    )
+    server.daemon_threads = True
+    print(f"Fake OpenAI on http://127.0.0.1:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# generators/job_trim.py
+"""
+Fit a scraped job description into a fixed token budget before it goes into
+the prompt.
+
+The description is split into sections at known Swedish/English headings.
+Known boilerplate lines (application instructions, recruiter disclaimers,
+benefit perks) and repeated paragraphs are dropped outright; then sections are
+kept by relevance — requirements, then the role, then the company, then
+benefits and application details — until the budget is used up. Kept sections stay in their original order.
+"""
+
+import re
+
+from config.settings import DESCRIPTION_TOKEN_BUDGET
+from data.resume_utils import estimate_tokens
+
+MIN_PARTIAL = 50   # tokens left at which an overlong line is cut instead of skipped
+
+# Lower is more relevant; the text before the first heading counts as the role
+REQUIREMENTS, ROLE, COMPANY, BENEFITS = range(4)
+
+HEADINGS = {
+    REQUIREMENTS: (
+        "kvalifikationer", "krav", "vi söker dig som", "du har", "din profil",
+        "om dig", "meriterande", "erfarenhet", "kompetens",
+        "requirements", "qualifications", "your profile", "who you are",
+        "skills", "what we're looking for", "what we are looking for", "nice to have",
+    ),
+    ROLE: (
+        "om jobbet", "om tjänsten", "om rollen", "arbetsuppgifter",
+        "dina arbetsuppgifter", "i rollen", "beskrivning",
+        "about the job", "about the role", "the role", "responsibilities",
+        "what you'll do", "what you will do", "job description",
+    ),
+    COMPANY: (
+        "om företaget", "om oss", "om arbetsgivaren", "vilka är vi", "vem är vi",
+        "about us", "about the company", "who we are", "our company",
+    ),
+    BENEFITS: (
+        "vi erbjuder", "förmåner", "anställningsform", "lön", "ansökan",
+        "så ansöker du", "urval", "övrigt", "tillträde", "varaktighet",
+        "arbetstid", "benefits", "we offer", "what we offer", "perks",
+        "how to apply", "application",
+    ),
+}
+
+BOILERPLATE = re.compile("|".join((
+    r"välkommen med din ansökan",
+    r"urval(et)? (sker|görs) löpande",
+    r"löpande urval",
+    r"tjänsten kan (komma att )?tillsättas",
+    r"sista ansökningsdag",
+    r"vi undanber oss",
+    r"annonsförsäljare|rekryteringsföretag|bemanningsföretag",
+    r"friskvårdsbidrag|kollektivavtal|tjänstepension",
+    r"har du (några )?frågor",
+    r"ansök (redan )?idag",
+    r"vi ser fram emot (att få )?din ansökan",
+    r"equal opportunit",
+    r"apply (now|today)",
+    r"we look forward to (receiving )?your application",
+    r"we do not accept .*(agenc|recruit)",
+)), re.IGNORECASE)
+
+def _heading_kind(line: str) -> int | None:
+    """The section kind a heading line starts, or None for ordinary text."""
+    key = line.strip().rstrip(":").lower()
+    if not key or len(key) > 40 or key.endswith("."):
+        return None
+    for kind, names in HEADINGS.items():
+        if key in names:
+            return kind
+    return None
+
+def split_sections(text: str) -> list[tuple[int, list[str]]]:
+    """[(kind, lines)] in document order, boilerplate and repeated lines removed."""
+    sections = [(ROLE, [])]
+    seen = set()
+    for line in text.splitlines():
+        line = line.strip()
+        kind = _heading_kind(line)
+        if kind is not None:
+            sections.append((kind, [line]))
+            continue
+        if not line or BOILERPLATE.search(line):
+            continue
+        key = line.lower()
+        if key in seen:   # company blurbs are often pasted twice
+            continue
+        seen.add(key)
+        sections[-1][1].append(line)
+    return [(kind, lines) for kind, lines in sections if lines]
+
+def trim_description(text: str, budget: int = DESCRIPTION_TOKEN_BUDGET) -> str:
+    """
+    `text` without boilerplate, cut by section relevance to about `budget`
+    tokens. A less relevant section is only kept when every more relevant one
+    fit whole, and the section the budget runs out in keeps its heading and at
+    least MIN_PARTIAL tokens of text.
+    """
+    sections = split_sections(text)
+    kept     = [[] for _ in sections]
+    left     = budget
+    for idx in sorted(range(len(sections)), key=lambda i: sections[i][0]):
+        for line in sections[idx][1]:
+            cost = estimate_tokens(line) + 1
+            if cost <= left:
+                kept[idx].append(line)
+                left -= cost
+                continue
+            if _heading_kind(line) is not None:
+                kept[idx].append(line)   # goes with the cut text below
+                continue
+            # Out of budget: cut the overlong line rather than lose it, keeping at
+            # least MIN_PARTIAL tokens of a section that has no text yet, and
+            # stop so no less relevant section is kept in place of this one
+            has_text = any(_heading_kind(l) is None for l in kept[idx])
+            room     = left if has_text else max(left, MIN_PARTIAL)
+            if room >= MIN_PARTIAL:
+                kept[idx].append(line[:(room - 1) * 4].rstrip() + " …")
+            left = 0
+            break
+        if left <= 0:
+            break
+
+    # A heading whose text didn't fit is left out as well
+    return "\n".join(
+        line for lines in kept for line in lines
+        if not (len(lines) == 1 and _heading_kind(lines[0]) is not None)
+    )
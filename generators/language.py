@@ -0,0 +1,69 @@
+# generators/language.py
+"""
+Swedish-or-English detection for job descriptions.
+
+Platsbanken ads are written in one of two languages, so instead of a general
+detector this counts common function words of each language (plus å/ä/ö) in
+the first few KB of the text. When that is a tie (a short ad may have no
+function words at all, e.g. "Senior Backend Engineer (Python/Go)"), the text is
+Swedish only if it has an å, ä or ö in it. Results are memoised by description
+hash, since the same description is looked at again for every prompt built
+from it.
+"""
+
+import re
+import hashlib
+
+SAMPLE_CHARS = 4096   # only the start of the description is looked at
+MEMO_SIZE    = 4096   # descriptions remembered before the memo is cleared
+
+_SV_WORDS = """
+och att det som en på är av för med till den har de inte om ett han men var
+jag sig från vi så kan man när år säger hon under också efter eller nu sin
+där vid mot ska skulle kommer ut får finns vara hade alla andra mycket än här
+då sedan över bara in blir upp även vad få två vill ha många hur mer går
+sina du dig oss våra vår vårt dina ditt din samt hos inom arbete tjänsten
+erfarenhet söker arbeta vänliga ansökan kunskaper krav meriterande
+"""
+_EN_WORDS = """
+the of and to in is you that it he was for on are as with his they at be
+this have from or one had by but not what all were we when your can said
+there use an each which she do how their if will up other about out many
+then them these so some her would make like him into time has look two more
+our who its now work team experience looking role skills knowledge apply
+we're you'll join candidate position
+"""
+
+_WORD_RE = re.compile(r"[a-zåäöé']+")
+_model   = None
+_memo    = {}
+
+def _load_model() -> dict:
+    """Word → +1 (Swedish) / -1 (English), built on first use."""
+    global _model
+    if _model is None:
+        sv = set(_SV_WORDS.split())
+        en = set(_EN_WORDS.split())
+        _model = {w: 1 for w in sv - en}
+        _model.update({w: -1 for w in en - sv})
+    return _model
+
+def detect_language(text: str) -> str:
+    """'sv' or 'en' for `text`."""
+    key = hashlib.sha1(text.encode("utf-8")).digest()
+    if key in _memo:
+        return _memo[key]
+
+    model  = _load_model()
+    sample = text[:SAMPLE_CHARS].lower()
+    marks  = sum(sample.count(c) for c in "åäö")
+    score  = sum(model.get(w, 0) for w in _WORD_RE.findall(sample)) + marks // 4
+    if score:
+        code = "sv" if score > 0 else "en"
+    else:
+        code = "sv" if marks else "en"   # no evidence either way from words
+
+    if len(_memo) >= MEMO_SIZE:
+        _memo.clear()
+    _memo[key] = code
+    return code
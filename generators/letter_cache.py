@@ -0,0 +1,87 @@
+# generators/letter_cache.py
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+
+from config.settings import LETTER_CACHE_DIR, LETTER_CACHE_MAX_MB, LETTER_CACHE_MAX_AGE_DAYS
+
+def request_key(request: dict) -> str:
+    """Content address of a chat-completion request: model, sampling params and prompt."""
+    keyed = {k: request[k] for k in ("model", "temperature", "max_tokens", "messages")}
+    blob  = json.dumps(keyed, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+class LetterCache:
+    """
+    On-disk cache of generated letters (without footer), one file per request
+    hash. Entries written more than `max_age_days` ago are dropped, and the
+    least recently used ones go first once the cache grows past `max_mb`
+    (a hit stamps the file's access time; its mtime stays the write time).
+    """
+
+    def __init__(self, root: Path = LETTER_CACHE_DIR,
+                 max_mb: float = LETTER_CACHE_MAX_MB,
+                 max_age_days: float = LETTER_CACHE_MAX_AGE_DAYS):
+        self.root      = Path(root)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age   = max_age_days * 24 * 60 * 60
+        self.hits      = 0
+        self.misses    = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.size = sum(p.stat().st_size for p in self.root.glob("*.txt"))
+        self.evict()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.txt"
+
+    def get(self, request: dict) -> str | None:
+        path = self._path(request_key(request))
+        try:
+            st = path.stat()
+            if time.time() - st.st_mtime > self.max_age:
+                raise FileNotFoundError
+            letter = path.read_text(encoding="utf-8")
+            os.utime(path, (time.time(), st.st_mtime))   # mark as used for eviction
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return letter
+
+    def put(self, request: dict, letter: str):
+        path = self._path(request_key(request))
+        tmp  = path.with_suffix(".tmp")
+        tmp.write_text(letter, encoding="utf-8")
+        try:
+            self.size -= path.stat().st_size   # overwriting an entry
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+        self.size += path.stat().st_size
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used until under the size cap."""
+        now = time.time()
+        entries = []
+        for p in self.root.glob("*.txt"):
+            st = p.stat()
+            if now - st.st_mtime > self.max_age:
+                p.unlink(missing_ok=True)
+            else:
+                entries.append((max(st.st_atime, st.st_mtime), st.st_size, p))
+        self.size = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if self.size <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            self.size -= size
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate  = f"{100 * self.hits / total:.0f}%" if total else "n/a"
+        return f"letter cache: {self.hits} hits, {self.misses} misses ({rate} hit rate)"
@@ -0,0 +1,154 @@
+# generators/rate_limit.py
+"""
+Client-side pacing for the OpenAI API.
+
+The account's request and token budgets are modelled as two token buckets.
+Every response carries `x-ratelimit-remaining-*` / `x-ratelimit-reset-*`
+headers, which re-sync the buckets with the server's view, so requests go out
+as fast as the account allows and wait only when a budget is actually spent.
+429s and 5xx responses are retried with jittered exponential backoff.
+"""
+
+import re
+import time
+import random
+import asyncio
+
+import openai
+
+from config.settings import OPENAI_RPM, OPENAI_TPM, OPENAI_MAX_RETRIES
+
+BACKOFF_BASE = 1.0    # seconds before the first retry
+BACKOFF_MAX  = 60.0   # longest single backoff
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT        = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+def parse_duration(value: str | None) -> float | None:
+    """Seconds in an OpenAI reset header such as '1s', '6m0s' or '20ms'."""
+    if not value:
+        return None
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(n) * _UNIT[unit] for n, unit in parts)
+
+def request_tokens(request: dict) -> int:
+    """Tokens a chat request counts against the budget: prompt estimate + max_tokens."""
+    chars = sum(len(m.get("content") or "") for m in request.get("messages", []))
+    return chars // 4 + (request.get("max_tokens") or 0)
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+class TokenBucket:
+    """`capacity` units refilled evenly over `period` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.level    = capacity
+        self.period   = period
+        self.rate     = capacity / period
+        self.updated  = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level   = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= amount
+
+    def sync(self, limit: int | None, remaining: int | None, reset: float | None,
+             now: float):
+        """Adopt the server's limit/remaining/reset-until-full figures."""
+        self._refill(now)
+        if limit and limit != self.capacity:
+            self.capacity = limit
+            self.rate     = limit / self.period
+        if remaining is not None:
+            # Requests still in flight aren't reflected yet; never move up
+            self.level = min(self.level, remaining)
+            if reset and remaining < self.capacity:
+                self.rate = (self.capacity - remaining) / reset
+
+class RateLimiter:
+    """Shared by all concurrent requests of a run; see `call`."""
+
+    def __init__(self, rpm: int = OPENAI_RPM, tpm: int = OPENAI_TPM,
+                 max_retries: int = OPENAI_MAX_RETRIES):
+        self.requests    = TokenBucket(rpm)
+        self.tokens      = TokenBucket(tpm)
+        self.max_retries = max_retries
+        self.lock        = asyncio.Lock()
+        self.retries     = 0
+        self.waited      = 0.0
+
+    async def acquire(self, tokens: int):
+        """Wait until one request and `tokens` tokens fit the budget, then spend them."""
+        async with self.lock:
+            while True:
+                now  = time.monotonic()
+                wait = max(self.requests.wait_time(1, now),
+                           self.tokens.wait_time(tokens, now))
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return
+                self.waited += wait
+                await asyncio.sleep(wait)
+
+    def update(self, headers):
+        """Re-sync both buckets from a response's rate-limit headers."""
+        if headers is None:
+            return
+        now = time.monotonic()
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            limit     = headers.get(f"x-ratelimit-limit-{kind}")
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            bucket.sync(
+                int(limit) if limit else None,
+                int(remaining) if remaining else None,
+                parse_duration(headers.get(f"x-ratelimit-reset-{kind}")),
+                now,
+            )
+
+    async def call(self, send, tokens: int):
+        """
+        Run `send()` (a coroutine function returning an openai raw response)
+        within the budget, retrying 429s, 5xx and connection errors. Returns
+        the parsed response.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(tokens)
+            try:
+                raw = await send()
+            except (openai.RateLimitError, openai.InternalServerError,
+                    openai.APIConnectionError) as e:
+                if attempt == self.max_retries:
+                    raise
+                response = getattr(e, "response", None)
+                headers  = response.headers if response is not None else None
+                self.update(headers)
+                delay = parse_duration(headers.get("retry-after")) if headers else None
+                delay = max(delay or 0.0, backoff_delay(attempt))
+                self.retries += 1
+                print(f"[RateLimit] {type(e).__name__}, retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            self.update(raw.headers)
+            return raw.parse()
+
+    def summary(self) -> str:
+        return f"{self.retries} retries, {self.waited:.1f}s waiting for budget"
@@ -1,14 +1,21 @@
 import os
-import re
+import time
+import argparse
 import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.firefox import GeckoDriverManager
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+from data.job_files  import write_job, ad_id_from_url
+from data.job_store  import JobStore
+from config.settings import JOB_DB
+from scraper.browser import make_driver, resolve_driver_path, safe_get, PROFILES
+from scraper.checkpoint import Checkpoint
+from scraper.detail  import collect_cards
+from scraper.pool    import DetailPool, MODES
+from scraper.seen    import SeenIndex
+from scraper.warm    import load_warm_drivers
 
 # ─── Configuration ────────────────────────────────────────────────────────────
 START_URL = (
@@ -17,42 +24,60 @@ START_URL = (
 )
 today_str  = datetime.date.today().isoformat()
 OUTPUT_DIR = today_str
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# ─── Selenium setup ───────────────────────────────────────────────────────────
-options = Options()
-options.headless            = True
-options.page_load_strategy  = "eager"
-options.add_argument("--width=1680")
-options.add_argument("--height=940")
+# Ads scraped on earlier runs, so unchanged ones aren't opened again
+SEEN_INDEX = os.getenv("SCRAPER_SEEN_INDEX", "seen_ads.json")
 
-service = Service(GeckoDriverManager().install())
-driver  = webdriver.Firefox(service=service, options=options)
-driver.set_page_load_timeout(60)
+# How often the listing browser may be restarted after a crash before giving up
+MAX_RESTARTS = 3
 
-def safe_get(url, retries=1):
-    for i in range(retries+1):
-        try:
-            driver.get(url)
-            return
-        except TimeoutException:
-            if i < retries:
-                print(f"[Retry] loading {url}")
-            else:
-                print(f"[Error] could not load {url}")
-
-def slugify(text: str) -> str:
-    s = text.lower()
-    s = re.sub(r"[^\w\s-]", "", s)
-    s = re.sub(r"[\s_-]+", "-", s).strip("-")
-    return s or "job"
+# Number of headless detail-page drivers (one per CPU is a good ceiling)
+DEFAULT_WORKERS = int(os.getenv("SCRAPER_WORKERS", os.cpu_count() or 1))
 
-# ─── Main scraping logic ──────────────────────────────────────────────────────
-try:
-    # 1) Load first page of listings
-    safe_get(START_URL, retries=2)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape Platsbanken job ads.")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"concurrent detail-page drivers (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--mode", choices=MODES, default="browser",
+        help="fetch detail pages with the browser, or over plain HTTP with "
+             "browser fallback (default: browser)"
+    )
+    parser.add_argument(
+        "--start-url", default=START_URL,
+        help="listing URL to start from (e.g. a local fixture server)"
+    )
+    parser.add_argument(
+        "--profile", choices=PROFILES, default="lean",
+        help="lean blocks images, fonts, CSS and trackers; full loads "
+             "pages as a normal browser would (default: lean)"
+    )
+    parser.add_argument(
+        "--attach", action="store_true",
+        help="reuse warm browser sessions started with `python -m scraper.warm`"
+    )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="re-scrape every ad, even those already in the seen-ads index"
+    )
+    parser.add_argument(
+        "--output-dir", default=OUTPUT_DIR,
+        help=f"folder for the job files and checkpoint (default: {OUTPUT_DIR})"
+    )
+    parser.add_argument(
+        "--no-txt", action="store_true",
+        help=f"only write jobs to the job store ({JOB_DB}), not as .txt files"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="continue the unfinished run in --output-dir from its checkpoint"
+    )
+    return parser.parse_args()
 
-    # 2) Accept cookies if prompted
+# ─── Main scraping logic ──────────────────────────────────────────────────────
+def accept_cookies(driver):
     try:
         WebDriverWait(driver, 5).until(
             EC.element_to_be_clickable((By.XPATH, "//button[contains(text(),'Jag godkänner')]"))
@@ -60,114 +85,187 @@ try:
     except:
         pass
 
-    # 3) Prepare global counters
-    file_counter = 1
-    page_number  = 1
+def main():
+    args = parse_args()
+    output_dir = args.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Pick up where an earlier run stopped, or start a fresh checkpoint
+    checkpoint = Checkpoint.load(output_dir) if args.resume else None
+    if checkpoint is not None and checkpoint.finished:
+        print(f"The run in ./{output_dir}/ already finished, nothing to resume")
+        return
+    if checkpoint is None:
+        if args.resume:
+            print(f"No checkpoint in ./{output_dir}/, starting from the first page")
+        checkpoint = Checkpoint(output_dir)
+        checkpoint.url = args.start_url
+    else:
+        print(
+            f"Resuming at page {checkpoint.page} with file {checkpoint.next_file:03d} "
+            f"({len(checkpoint.done)} ads done, {len(checkpoint.queued)} in flight)"
+        )
+
+    # Resolve geckodriver once and share it between the listing and pool drivers
+    t0 = time.perf_counter()
+    driver_path = resolve_driver_path()
+    t_driver = time.perf_counter() - t0
+
+    warm     = load_warm_drivers() if args.attach else []
+    attached = bool(warm)
+    if attached:
+        driver = warm.pop(0)
+    else:
+        if args.attach:
+            print("No warm sessions found, starting a new browser")
+        driver = make_driver(driver_path, profile=args.profile, profile_name="listing")
+    t_browser = time.perf_counter() - t0 - t_driver
+    print(
+        f"[Startup] geckodriver resolved in {t_driver:.2f} s, "
+        f"{'attached to warm' if attached else 'cold-started'} browser "
+        f"in {t_browser:.2f} s"
+    )
 
-    # 4) Paginate through all listing pages
-    while True:
-        print(f"=== Page {page_number} ===")
+    pool = DetailPool(
+        driver_path, workers=args.workers, mode=args.mode,
+        profile=args.profile, warm=warm,
+    )
+    print(
+        f"Scraping detail pages with {pool.workers} worker(s) in {pool.mode} mode "
+        f"({args.profile} browser profile)"
+    )
+
+    store = JobStore(JOB_DB)
+    seen  = SeenIndex(SEEN_INDEX)
+    print(f"Seen-ads index: {len(seen)} known ads in {SEEN_INDEX}")
+    skipped = 0
+    saved   = 0
+
+    def submit(link, card_text):
+        checkpoint.queued[link] = card_text
+        pool.submit(link)
+
+    def flush(wait=False):
+        # Write finished jobs in listing order so numbering stays stable
+        nonlocal saved
+        batch = []
+        for link, job in pool.ready(wait=wait):
+            card_text = checkpoint.queued.pop(link, "")
+            checkpoint.done.add(link)
+            if job is None:
+                continue
+            batch.append(job)
+            path = ""
+            if not args.no_txt:
+                path = write_job(output_dir, checkpoint.next_file, job)
+                print(f"[Saved] {path}")
+                checkpoint.next_file += 1
+            saved += 1
+            ad_id = ad_id_from_url(link)
+            if ad_id:
+                seen.record(ad_id, card_text, job, path)
+        if batch:
+            store.upsert_jobs(batch)
+
+    def save_progress():
+        checkpoint.save()
+        seen.save()
+
+    def scrape_page() -> bool:
+        """Queue the current listing page and move on. Returns False on the last page."""
+        nonlocal skipped
+        print(f"=== Page {checkpoint.page} ===")
+        checkpoint.url = driver.current_url
 
         # Wait for all job cards to appear
+        t0 = time.perf_counter()
         cards = WebDriverWait(driver, 10).until(
             EC.presence_of_all_elements_located(
                 (By.XPATH, "//a[contains(@href,'/platsbanken/annonser/')]")
             )
         )
 
-        # 5) Loop over each card on this page
-        for card in cards:
-            link = card.get_attribute("href")
-            if not link:
+        # Queue new or changed cards on this page for the detail workers
+        page_cards = collect_cards(driver)
+        listing_ms = (time.perf_counter() - t0) * 1000
+        for link, card_text in page_cards:
+            if link in checkpoint.done or link in checkpoint.queued:
                 continue
-
-            # Open detail in new tab
-            driver.execute_script("window.open(arguments[0]);", link)
-            driver.switch_to.window(driver.window_handles[-1])
-
-            # Wait for content
-            try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "h1"))
-                )
-            except:
-                driver.close()
-                driver.switch_to.window(driver.window_handles[0])
+            ad_id = ad_id_from_url(link)
+            if not args.full and ad_id and seen.is_known(ad_id, card_text):
+                skipped += 1
                 continue
+            submit(link, card_text)
+        flush()
+        save_progress()
 
-            # — Extract fields —
-            title = driver.find_element(By.TAG_NAME, "h1").text.strip()
-
-            try:
-                company = driver.find_element(
-                    By.XPATH, "//strong[contains(@class,'pb-company')]"
-                ).text.strip()
-            except:
-                company = ""
-
-            try:
-                loc_txt = driver.find_element(
-                    By.XPATH, "//*[contains(text(),'Kommun:')]"
-                ).text
-                location = loc_txt.split("Kommun:")[-1].strip()
-            except:
-                location = ""
-
-            body = driver.find_element(By.TAG_NAME, "body").text
-            content = body.split("Kontakt", 1)[0] if "Kontakt" in body else body
-            # Start description at “Kvalifikationer” or “Om jobbet”
-            idx1, idx2 = content.find("Kvalifikationer"), content.find("Om jobbet")
-            start = 0
-            if idx1 != -1 and (idx2 == -1 or idx1 < idx2):
-                start = idx1
-            elif idx2 != -1:
-                start = idx2
-            description = content[start:].strip()
+        done, per_detail = pool.timing()
+        print(
+            f"[Timing] page {checkpoint.page}: {len(page_cards)} cards collected in "
+            f"{listing_ms:.0f} ms; {done} detail pages at {per_detail*1000:.0f} ms each"
+        )
 
-            try:
-                mailto = driver.find_element(
-                    By.XPATH, "//a[starts-with(@href,'mailto:')]"
-                ).get_attribute("href")
-                contact_email = mailto.split("mailto:")[-1].strip()
-            except:
-                contact_email = ""
-
-            # — Save to its own file —
-            slug  = slugify(title)
-            fname = f"{file_counter:03d}-{slug}.txt"
-            path  = os.path.join(OUTPUT_DIR, fname)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(f"Title: {title}\n")
-                f.write(f"Company: {company}\n")
-                f.write(f"Location: {location}\n\n")
-                f.write("Description:\n")
-                f.write(description + "\n\n")
-                f.write(f"Contact Email: {contact_email}\n")
-                f.write(f"URL: {link}\n")
-
-            print(f"[Saved] {path}")
-            file_counter += 1
-
-            # Close tab and switch back
-            driver.close()
-            driver.switch_to.window(driver.window_handles[0])
-
-        # 6) Try to click the “Nästa” button
+        # Try to click the “Nästa” button
         try:
             nxt = driver.find_element(
                 By.XPATH,
                 "//button[.//span[contains(text(),'Nästa')]]"
             )
-            driver.execute_script("arguments[0].click()", nxt)
-            page_number += 1
-            # Wait for the previous first card to become stale
-            WebDriverWait(driver, 10).until(EC.staleness_of(cards[0]))
         except NoSuchElementException:
             # No more pages left
-            break
+            return False
+        driver.execute_script("arguments[0].click()", nxt)
+        # Wait for the previous first card to become stale
+        WebDriverWait(driver, 10).until(EC.staleness_of(cards[0]))
+        checkpoint.page += 1
+        return True
+
+    try:
+        # 1) Re-queue ads that were still in flight when the last run stopped
+        for link, card_text in list(checkpoint.queued.items()):
+            pool.submit(link)
+
+        # 2) Load the listing page we're on and accept cookies if prompted
+        safe_get(driver, checkpoint.url, retries=2)
+        accept_cookies(driver)
+
+        # 3) Paginate through all listing pages, restarting the browser on crashes
+        restarts = 0
+        while True:
+            try:
+                if not scrape_page():
+                    break
+            except WebDriverException as e:
+                restarts += 1
+                if restarts > MAX_RESTARTS:
+                    raise
+                print(f"[Restart] listing browser failed on page {checkpoint.page}: {e.msg}")
+                save_progress()
+                try:
+                    if not attached:
+                        driver.quit()
+                except Exception:
+                    pass
+                driver   = make_driver(driver_path, profile=args.profile, profile_name="listing")
+                attached = False
+                safe_get(driver, checkpoint.url, retries=2)
+                accept_cookies(driver)
+
+        # 4) Drain whatever the workers are still busy with
+        flush(wait=True)
+        checkpoint.finished = True
 
-    print(f"Done! Scraped {file_counter-1} jobs into ./{OUTPUT_DIR}/")
+        print(f"Done! Scraped {saved} jobs into ./{output_dir}/ and {JOB_DB}")
+        print(f"Skipped {skipped} ads already in the seen-ads index")
+        if pool.mode == "http":
+            print(f"Browser fallbacks: {pool.fallbacks}")
 
-finally:
-    driver.quit()
+    finally:
+        pool.close()
+        if not attached:
+            driver.quit()
+        save_progress()
+        store.close()
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# scraper/bench_profile.py
+"""
+Compare the lean and full browser profiles on the local fixture server.
+
+    python -m scraper.bench_profile --pages 30
+
+For each profile a fresh headless Firefox loads the same detail pages and we
+report mean/median page-load time and the resident memory of the whole
+Firefox process tree afterwards.
+"""
+
+import os
+import time
+import argparse
+import statistics
+
+from scraper.browser        import PROFILES, make_driver, resolve_driver_path
+from scraper.detail         import scrape_detail
+from scraper.fixture_server import serve, LISTING_PATH
+
+def _children(pid: int) -> list[int]:
+    kids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            kids.append(int(entry))
+    return kids
+
+def tree_rss_mb(pid: int) -> float:
+    """Resident memory of `pid` and all its descendants, in MB (Linux only)."""
+    total, todo = 0, [pid]
+    while todo:
+        p = todo.pop()
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+        todo.extend(_children(p))
+    return total / 1024
+
+def run_profile(driver_path: str, base_url: str, profile: str, pages: int) -> dict:
+    driver = make_driver(driver_path, headless=True, profile=profile)
+    try:
+        timings = []
+        for ad_id in range(1, pages + 1):
+            t0 = time.perf_counter()
+            scrape_detail(driver, f"{base_url}{LISTING_PATH}/{ad_id}")
+            timings.append(time.perf_counter() - t0)
+        rss = tree_rss_mb(driver.service.process.pid)
+    finally:
+        driver.quit()
+    return {
+        "mean_ms":   statistics.mean(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "rss_mb":    rss,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lean vs full browser profiles.")
+    parser.add_argument("--pages", type=int,   default=30)
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="latency added by the fixture server per response")
+    args = parser.parse_args()
+
+    server   = serve(jobs=args.pages, delay=args.delay)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    driver_path = resolve_driver_path()
+
+    print(f"{'profile':<8} {'mean':>9} {'median':>9} {'RSS':>9}")
+    for profile in PROFILES:
+        r = run_profile(driver_path, base_url, profile, args.pages)
+        print(f"{profile:<8} {r['mean_ms']:>7.0f}ms {r['median_ms']:>7.0f}ms {r['rss_mb']:>7.0f}MB")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# scraper/browser.py
+
+import os
+import json
+import time
+import shutil
+import subprocess
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options
+from selenium.webdriver.firefox.service import Service
+from selenium.common.exceptions import TimeoutException
+
+PAGE_LOAD_TIMEOUT = 60
+
+# Resolved geckodriver path, reused for a week and whenever we're offline
+DRIVER_CACHE     = os.getenv("SCRAPER_DRIVER_CACHE", ".geckodriver.json")
+DRIVER_CACHE_TTL = 7 * 24 * 60 * 60
+
+PROFILES     = ("lean", "full")
+PROFILE_ROOT = os.getenv("SCRAPER_PROFILE_DIR", "browser_profiles")
+
+# Everything we only need to read page text: no images, fonts, stylesheets,
+# trackers/analytics, media or speculative network work, and no disk cache.
+LEAN_PREFS = {
+    "permissions.default.image":                     2,
+    "permissions.default.stylesheet":                2,
+    "gfx.downloadable_fonts.enabled":                False,
+    "browser.display.use_document_fonts":            0,
+    "privacy.trackingprotection.enabled":            True,
+    "privacy.trackingprotection.socialtracking.enabled": True,
+    "privacy.trackingprotection.cryptomining.enabled":   True,
+    "privacy.trackingprotection.fingerprinting.enabled": True,
+    "media.autoplay.default":                        5,
+    "media.peerconnection.enabled":                  False,
+    "network.prefetch-next":                         False,
+    "network.dns.disablePrefetch":                   True,
+    "network.http.speculative-parallel-limit":       0,
+    "browser.cache.disk.enable":                     False,
+    "browser.cache.offline.enable":                  False,
+    "dom.serviceWorkers.enabled":                    False,
+    "dom.webnotifications.enabled":                  False,
+    "geo.enabled":                                   False,
+    "toolkit.telemetry.enabled":                     False,
+    "datareporting.healthreport.uploadEnabled":      False,
+    "browser.shell.checkDefaultBrowser":             False,
+}
+
+def _driver_version(path: str) -> str:
+    try:
+        out = subprocess.run(
+            [path, "--version"], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return out.splitlines()[0].strip() if out else ""
+
+def resolve_driver_path() -> str:
+    """
+    Return a geckodriver path without hitting the network on every launch.
+
+    A cached path (stamped with the driver's version) is reused while fresh
+    and the binary there still reports that version; otherwise (expired, or
+    the driver was replaced or upgraded) webdriver-manager is asked, and if
+    that fails (e.g. offline) we fall back to the cached path or a geckodriver
+    on PATH.
+    """
+    cached = {}
+    if os.path.exists(DRIVER_CACHE):
+        with open(DRIVER_CACHE, encoding="utf-8") as f:
+            cached = json.load(f)
+    cached_path = cached.get("path")
+    usable = bool(cached_path) and os.path.exists(cached_path)
+
+    if usable and time.time() - cached.get("resolved", 0) < DRIVER_CACHE_TTL:
+        version = _driver_version(cached_path)
+        if version and version == cached.get("version"):
+            return cached_path
+        print(f"[Driver] {cached_path} changed ({cached.get('version')!r} → {version!r}); re-resolving")
+
+    try:
+        from webdriver_manager.firefox import GeckoDriverManager
+        path = GeckoDriverManager().install()
+    except Exception as e:
+        fallback = cached_path if usable else shutil.which("geckodriver")
+        if not fallback:
+            raise RuntimeError(f"Could not resolve geckodriver: {e}") from e
+        print(f"[Driver] webdriver-manager failed ({e}); using {fallback}")
+        return fallback
+
+    with open(DRIVER_CACHE, "w", encoding="utf-8") as f:
+        json.dump({
+            "path":     path,
+            "version":  _driver_version(path),
+            "resolved": time.time(),
+        }, f, indent=1)
+    return path
+
+def profile_path(name: str) -> str:
+    """Persistent Firefox profile directory for `name`, created on first use."""
+    path = os.path.abspath(os.path.join(PROFILE_ROOT, name))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def make_driver(driver_path: str, headless: bool = True,
+                profile: str = "full", profile_name: str | None = None) -> webdriver.Firefox:
+    """
+    Start a Firefox driver configured the way the scraper expects.
+
+    `profile="lean"` blocks everything text extraction doesn't need (see
+    LEAN_PREFS). With `profile_name`, Firefox runs on a persistent profile
+    under PROFILE_ROOT that is kept across runs; each concurrently running
+    driver needs its own name.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown browser profile {profile!r}, expected one of {PROFILES}")
+
+    options = Options()
+    if headless:
+        options.add_argument("-headless")
+    options.page_load_strategy = "eager"
+    options.add_argument("--width=1680")
+    options.add_argument("--height=940")
+    if profile == "lean":
+        for key, value in LEAN_PREFS.items():
+            options.set_preference(key, value)
+    if profile_name:
+        options.add_argument("-profile")
+        options.add_argument(profile_path(f"{profile}-{profile_name}"))
+
+    driver = webdriver.Firefox(service=Service(driver_path), options=options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    return driver
+
+class AttachedFirefox(webdriver.Remote):
+    """
+    A driver bound to an already running session (see scraper/warm.py),
+    so no browser has to be started. Don't call quit() on it: that would end
+    the warm session for everybody else.
+    """
+
+    def __init__(self, url: str, session_id: str):
+        self._attach_to = session_id
+        super().__init__(command_executor=url, options=Options())
+
+    def start_session(self, capabilities: dict) -> None:
+        self.session_id = self._attach_to
+        self.caps = {}
+
+def attach_driver(url: str, session_id: str) -> AttachedFirefox | None:
+    """Attach to a warm session, or return None if it is gone."""
+    try:
+        driver = AttachedFirefox(url, session_id)
+        driver.current_url  # cheap liveness check
+    except Exception:
+        return None
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    return driver
+
+def safe_get(driver, url: str, retries: int = 1) -> bool:
+    """Load `url`, retrying on page-load timeouts. Returns True on success."""
+    for i in range(retries+1):
+        try:
+            driver.get(url)
+            return True
+        except TimeoutException:
+            if i < retries:
+                print(f"[Retry] loading {url}")
+            else:
+                print(f"[Error] could not load {url}")
+    return False
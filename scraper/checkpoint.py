@@ -0,0 +1,56 @@
+# scraper/checkpoint.py
+
+import os
+import json
+
+class Checkpoint:
+    """
+    Progress of one scrape run, saved next to its output files:
+
+        {"page", "url", "next_file", "done": [hrefs], "queued": {href: card text},
+         "finished"}
+
+    `url` is the listing URL of the page being worked on, so a resumed run
+    can reload it directly. Links in `done` have already been written out;
+    `queued` ones were handed to the detail pool but not finished yet.
+    """
+
+    FILENAME = ".checkpoint.json"
+
+    def __init__(self, output_dir: str):
+        self.path      = os.path.join(output_dir, self.FILENAME)
+        self.page      = 1
+        self.url       = None
+        self.next_file = 1
+        self.done      = set()
+        self.queued    = {}
+        self.finished  = False
+
+    @classmethod
+    def load(cls, output_dir: str) -> "Checkpoint | None":
+        cp = cls(output_dir)
+        if not os.path.exists(cp.path):
+            return None
+        with open(cp.path, encoding="utf-8") as f:
+            data = json.load(f)
+        cp.page      = data["page"]
+        cp.url       = data["url"]
+        cp.next_file = data["next_file"]
+        cp.done      = set(data["done"])
+        cp.queued    = data.get("queued", {})
+        cp.finished  = data.get("finished", False)
+        return cp
+
+    def save(self):
+        # Atomic replace: a crash mid-write must not lose the previous state
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "page":      self.page,
+                "url":       self.url,
+                "next_file": self.next_file,
+                "done":      sorted(self.done),
+                "queued":    self.queued,
+                "finished":  self.finished,
+            }, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
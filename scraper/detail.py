@@ -0,0 +1,81 @@
+# scraper/detail.py
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from scraper.browser import safe_get
+
+# Same lookups as the old per-element find_element calls, done in the page
+EXTRACT_JS = """
+const first = xp => document.evaluate(
+    xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+const text = el => el ? el.innerText : "";
+const mail = first("//a[starts-with(@href,'mailto:')]");
+return {
+    title:    text(document.querySelector("h1")),
+    company:  text(first("//strong[contains(@class,'pb-company')]")),
+    location: text(first("//*[contains(text(),'Kommun:')]")),
+    body:     text(document.body),
+    mailto:   mail ? mail.getAttribute("href") : "",
+};
+"""
+
+# Every card's href and text from a listing page, in document order
+CARDS_JS = """
+return Array.from(
+    document.querySelectorAll("a[href*='/platsbanken/annonser/']"),
+    a => [a.href, a.innerText]
+);
+"""
+
+def extract_description(body: str) -> str:
+    """Cut the ad text from “Kvalifikationer”/“Om jobbet” up to “Kontakt”."""
+    content = body.split("Kontakt", 1)[0] if "Kontakt" in body else body
+    idx1, idx2 = content.find("Kvalifikationer"), content.find("Om jobbet")
+    start = 0
+    if idx1 != -1 and (idx2 == -1 or idx1 < idx2):
+        start = idx1
+    elif idx2 != -1:
+        start = idx2
+    return content[start:].strip()
+
+def scrape_detail(driver, link: str) -> dict | None:
+    """
+    Load a job ad in `driver` and extract its fields.
+    Returns None when the page never shows its title.
+    """
+    if not safe_get(driver, link):
+        return None
+
+    # Wait for content
+    try:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.TAG_NAME, "h1"))
+        )
+    except TimeoutException:
+        return None
+
+    # — Extract every field in one WebDriver round-trip —
+    fields = driver.execute_script(EXTRACT_JS)
+
+    title       = fields["title"].strip()
+    company     = fields["company"].strip()
+    location    = fields["location"].split("Kommun:")[-1].strip()
+    description = extract_description(fields["body"])
+    contact_email = fields["mailto"].split("mailto:")[-1].strip()
+
+    return {
+        "title":       title,
+        "company":     company,
+        "location":    location,
+        "description": description,
+        "email":       contact_email,
+        "url":         link,
+    }
+
+def collect_cards(driver) -> list[tuple[str, str]]:
+    """Return (href, card text) for every job card on the current listing page."""
+    return [(href, text) for href, text in driver.execute_script(CARDS_JS) if href]
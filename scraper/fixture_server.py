@@ -0,0 +1,155 @@
+# scraper/fixture_server.py
+"""
+Local stand-in for Platsbanken, so the scraper can be run offline.
+
+    python -m scraper.fixture_server --jobs 60 --port 8765
+    python main.py --start-url http://127.0.0.1:8765/platsbanken/annonser --mode http
+    scrapy crawl platsbanken -a start_url=http://127.0.0.1:8765/platsbanken/annonser
+
+Listing pages link to synthetic ads and carry a “Nästa” button; detail pages
+use the same markup the scraper's XPaths look for. Every `--spa-every`-th ad is
+served as an empty client-rendered shell to exercise the browser fallback, and
+`--delay` adds per-response latency for more realistic benchmarks. Pages pull in
+an image, a web font, a stylesheet and an "analytics" script from /static/, so
+the lean and full browser profiles have something to differ on.
+"""
+
+import argparse
+import html
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+LISTING_PATH = "/platsbanken/annonser"
+
+# Deterministic filler so asset sizes are realistic but reproducible
+_FILLER = bytes(range(256)) * 1024
+
+STATIC = {
+    "/static/site.css": (
+        "text/css",
+        b"@font-face{font-family:Pb;src:url(/static/font.woff2)}"
+        b"body{font-family:Pb,sans-serif}"
+        + b"".join(b".c%d{margin:%dpx}" % (i, i % 40) for i in range(4000)),
+    ),
+    "/static/font.woff2":   ("font/woff2", _FILLER[:120_000]),
+    "/static/logo.png":     ("image/png", _FILLER[:250_000]),
+    "/static/analytics.js": (
+        "application/javascript",
+        b"(function(){var s=0;for(var i=0;i<2e6;i++){s+=i%7}window._pb=s})();"
+        + b"/*" + b"x" * 150_000 + b"*/",
+    ),
+}
+
+_HEAD_ASSETS = (
+    "<link rel='stylesheet' href='/static/site.css'>"
+    "<script src='/static/analytics.js'></script>"
+)
+
+def _page(title: str, body: str) -> bytes:
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>{html.escape(title)}</title>{_HEAD_ASSETS}</head>"
+        f"<body><img src='/static/logo.png' alt=''>{body}</body></html>"
+    ).encode("utf-8")
+
+def render_listing(page: int, jobs: int, per_page: int) -> bytes:
+    first = (page - 1) * per_page + 1
+    last  = min(jobs, page * per_page)
+    cards = "".join(
+        f"<div class='card'><a href='{LISTING_PATH}/{ad_id}'>Annons {ad_id}</a></div>"
+        for ad_id in range(first, last + 1)
+    )
+    nxt = ""
+    if last < jobs:
+        nxt = (
+            "<button onclick=\"location.href='"
+            f"{LISTING_PATH}?page={page + 1}'\"><span>Nästa</span></button>"
+        )
+    return _page(f"Platsbanken – sida {page}", f"<h2>Lediga jobb</h2>{cards}{nxt}")
+
+def render_detail(ad_id: int, spa: bool = False) -> bytes:
+    if spa:
+        return _page(
+            "Platsbanken",
+            "<div id='app'></div><script>/* rendered client-side */</script>",
+        )
+    body = f"""
+<h1>Utvecklare {ad_id}</h1>
+<strong class="pb-company">Företag {ad_id % 17} AB</strong>
+<div>Kommun: Stockholm</div>
+<h2>Om jobbet</h2>
+<p>Vi söker en utvecklare till vårt team. Annons nummer {ad_id}.</p>
+<h3>Kvalifikationer</h3>
+<ul><li>Python</li><li>Selenium</li></ul>
+<h2>Kontakt</h2>
+<a href="mailto:jobb{ad_id}@example.com">jobb{ad_id}@example.com</a>
+"""
+    return _page(f"Utvecklare {ad_id}", body)
+
+def make_handler(jobs: int, per_page: int, spa_every: int, delay: float = 0.0):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            path  = parts.path.rstrip("/")
+            if path in STATIC:
+                content_type, payload = STATIC[path]
+                return self._send(payload, content_type)
+            if path == LISTING_PATH:
+                page = int(parse_qs(parts.query).get("page", ["1"])[0])
+                return self._send(render_listing(page, jobs, per_page))
+            if path.startswith(LISTING_PATH + "/"):
+                tail = path.rsplit("/", 1)[-1]
+                if tail.isdigit() and 1 <= int(tail) <= jobs:
+                    ad_id = int(tail)
+                    spa   = bool(spa_every) and ad_id % spa_every == 0
+                    return self._send(render_detail(ad_id, spa))
+            self.send_error(404)
+
+        def _send(self, payload: bytes, content_type: str = "text/html; charset=utf-8"):
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return FixtureHandler
+
+def serve(port: int = 0, jobs: int = 60, per_page: int = 25, spa_every: int = 0,
+          delay: float = 0.0):
+    """Start the fixture server in a background thread and return it."""
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", port), make_handler(jobs, per_page, spa_every, delay)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port",      type=int, default=8765)
+    parser.add_argument("--jobs",      type=int, default=60)
+    parser.add_argument("--per-page",  type=int, default=25)
+    parser.add_argument("--spa-every", type=int, default=0,
+                        help="serve every Nth ad as a client-rendered shell")
+    parser.add_argument("--delay",     type=float, default=0.0,
+                        help="seconds of latency added to every response")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", args.port),
+        make_handler(args.jobs, args.per_page, args.spa_every, args.delay),
+    )
+    print(f"Serving fixtures on http://127.0.0.1:{args.port}{LISTING_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
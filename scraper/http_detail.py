@@ -0,0 +1,88 @@
+# scraper/http_detail.py
+
+import httpx
+from parsel import Selector
+
+from scraper.detail import extract_description
+
+HTTP_TIMEOUT = 20.0
+USER_AGENT   = (
+    "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+)
+
+# Visible text only: skip anything inside script/style/noscript
+_TEXT_XPATH = (
+    "//body//text()[not(ancestor::script or ancestor::style or ancestor::noscript)]"
+)
+
+def _element_text(sel) -> str:
+    """Roughly what Selenium's `.text` gives: visible text, one line per node."""
+    parts = (t.strip() for t in sel.xpath(
+        ".//text()[not(ancestor::script or ancestor::style or ancestor::noscript)]"
+    ).getall())
+    return "\n".join(p for p in parts if p)
+
+def parse_detail_html(html: str, link: str) -> dict | None:
+    """
+    Extract job fields from a static detail page using the same XPaths as the
+    browser path. Returns None when the page has no title, i.e. the content is
+    rendered client-side and the browser has to take over.
+    """
+    sel = Selector(text=html)
+
+    h1 = sel.xpath("//h1")
+    title = _element_text(h1[0]).replace("\n", " ") if h1 else ""
+    if not title:
+        return None
+
+    company_el = sel.xpath("//strong[contains(@class,'pb-company')]")
+    company = _element_text(company_el[0]).replace("\n", " ") if company_el else ""
+
+    loc_el = sel.xpath("//*[contains(text(),'Kommun:')]")
+    if loc_el:
+        location = _element_text(loc_el[0]).split("Kommun:")[-1].strip()
+    else:
+        location = ""
+
+    body_parts = (t.strip() for t in sel.xpath(_TEXT_XPATH).getall())
+    body = "\n".join(p for p in body_parts if p)
+    description = extract_description(body)
+
+    mailto = sel.xpath("//a[starts-with(@href,'mailto:')]/@href").get()
+    contact_email = mailto.split("mailto:")[-1].strip() if mailto else ""
+
+    return {
+        "title":       title,
+        "company":     company,
+        "location":    location,
+        "description": description,
+        "email":       contact_email,
+        "url":         link,
+    }
+
+class HttpDetailFetcher:
+    """Fetch detail pages over one pooled, thread-safe httpx client."""
+
+    def __init__(self, max_connections: int = 10):
+        self.client = httpx.Client(
+            headers={"User-Agent": USER_AGENT},
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    def fetch(self, link: str) -> dict | None:
+        """Return the parsed job, or None if the browser should handle it."""
+        try:
+            resp = self.client.get(link)
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"[HTTP] {link}: {e}")
+            return None
+        return parse_detail_html(resp.text, link)
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,60 @@
+# scraper/pipelines.py
+
+import os
+
+from data.job_files import write_job
+from data.job_store import JobStore
+
+class JobFilePipeline:
+    """
+    Write each scraped job to `JOB_OUTPUT_DIR` in main.py's `NNN-slug.txt`
+    layout. The file counter lives in `spider.state`, so a crawl resumed
+    from a JOBDIR carries on numbering instead of overwriting earlier files.
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings.get("JOB_OUTPUT_DIR"))
+
+    def open_spider(self, spider):
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def process_item(self, item, spider):
+        state  = getattr(spider, "state", {})
+        number = state.get("file_counter", 1)
+        path   = write_job(self.output_dir, number, dict(item))
+        state["file_counter"] = number + 1
+        spider.state = state
+        spider.logger.debug(f"[Saved] {path}")
+        return item
+
+class JobStorePipeline:
+    """Bulk-upsert scraped jobs into the SQLite job store, `batch_size` at a time."""
+
+    batch_size = 100
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.batch   = []
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings.get("JOB_DB"))
+
+    def open_spider(self, spider):
+        self.store = JobStore(self.db_path)
+
+    def process_item(self, item, spider):
+        self.batch.append(dict(item))
+        if len(self.batch) >= self.batch_size:
+            self.store.upsert_jobs(self.batch)
+            self.batch = []
+        return item
+
+    def close_spider(self, spider):
+        if self.batch:
+            self.store.upsert_jobs(self.batch)
+        self.store.close()
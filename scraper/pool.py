@@ -0,0 +1,153 @@
+# scraper/pool.py
+
+import time
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import WebDriverException
+
+from scraper.browser import make_driver
+from scraper.detail  import scrape_detail
+from scraper.http_detail import HttpDetailFetcher
+
+MODES = ("browser", "http")
+
+class DetailPool:
+    """
+    A pool of headless Firefox drivers scraping job detail pages concurrently.
+
+    Links are submitted in listing order and results come back in that same
+    order, so file numbering matches a sequential run exactly.
+
+    In "http" mode pages are fetched without a browser first; a driver is only
+    started for pages whose static HTML lacks the job content.
+
+    `warm` drivers (attached to sessions from scraper/warm.py) are used before
+    any new browser is started, and are left running on close().
+    """
+
+    def __init__(self, driver_path: str, workers: int = 1, mode: str = "browser",
+                 profile: str = "full", warm: list | None = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown detail mode {mode!r}, expected one of {MODES}")
+        self.driver_path = driver_path
+        self.workers     = max(1, workers)
+        self.mode        = mode
+        self.profile     = profile
+        self.warm        = list(warm or [])
+        self.fetcher     = HttpDetailFetcher(self.workers) if mode == "http" else None
+        self.fallbacks   = 0
+        self.detail_seconds = 0.0
+        self.detail_count   = 0
+        self._executor   = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="detail"
+        )
+        self._local   = threading.local()
+        self._drivers = []
+        self._slots   = itertools.count()
+        self._lock    = threading.Lock()
+        self._pending = deque()
+
+    def _driver(self):
+        # One driver per worker thread, started on first use
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            slot = getattr(self._local, "slot", None)
+            if slot is None:
+                slot = self._local.slot = next(self._slots)
+            if slot < len(self.warm) and self.warm[slot] is not None:
+                driver = self.warm[slot]
+            else:
+                # Each worker keeps its own persistent profile, named by slot
+                driver = make_driver(
+                    self.driver_path, headless=True,
+                    profile=self.profile, profile_name=f"detail-{slot}",
+                )
+                with self._lock:
+                    self._drivers.append(driver)
+            self._local.driver = driver
+        return driver
+
+    def _scrape(self, link: str) -> dict | None:
+        t0  = time.perf_counter()
+        job = self._fetch(link)
+        with self._lock:
+            self.detail_seconds += time.perf_counter() - t0
+            self.detail_count   += 1
+        return job
+
+    def _fetch(self, link: str) -> dict | None:
+        if self.fetcher:
+            job = self.fetcher.fetch(link)
+            if job is not None:
+                return job
+            with self._lock:
+                self.fallbacks += 1
+        try:
+            return scrape_detail(self._driver(), link)
+        except WebDriverException as e:
+            # Browser crashed or hung: replace it and give the link one more go
+            print(f"[Restart] detail browser failed on {link}: {e.msg}")
+            self._restart_driver()
+            try:
+                return scrape_detail(self._driver(), link)
+            except WebDriverException as e:
+                print(f"[Error] giving up on {link}: {e.msg}")
+                return None
+
+    def _restart_driver(self):
+        driver = self._local.driver
+        self._local.driver = None
+        slot = self._local.slot
+        if slot < len(self.warm) and self.warm[slot] is driver:
+            # Never quit a warm session; just stop using it
+            self.warm[slot] = None
+            return
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def timing(self) -> tuple[int, float]:
+        """Return (detail pages done, mean seconds per page) and reset the counters."""
+        with self._lock:
+            count, total = self.detail_count, self.detail_seconds
+            self.detail_count, self.detail_seconds = 0, 0.0
+        return count, (total / count if count else 0.0)
+
+    def submit(self, link: str):
+        """Queue `link` for scraping."""
+        self._pending.append((link, self._executor.submit(self._scrape, link)))
+
+    def ready(self, wait: bool = False):
+        """
+        Yield (link, job) for finished links, in submission order.
+        Stops at the first unfinished link unless `wait` is set.
+        """
+        while self._pending:
+            link, future = self._pending[0]
+            if not wait and not future.done():
+                return
+            self._pending.popleft()
+            yield link, future.result()
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for driver in self._drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._drivers.clear()
+        if self.fetcher:
+            self.fetcher.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,64 @@
+# scraper/seen.py
+
+import os
+import json
+import hashlib
+import datetime
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def job_hash(job: dict) -> str:
+    """Hash of the fields we save, to tell whether an ad's content changed."""
+    return content_hash("\n".join(
+        job.get(k, "") for k in ("title", "company", "location", "description", "email")
+    ))
+
+class SeenIndex:
+    """
+    Persistent record of every ad the scraper has seen, stored as JSON:
+
+        {"<ad id>": {"card_hash", "content_hash", "first_seen", "last_seen", "file"}}
+
+    `card_hash` is the hash of the listing card's text, which lets the listing
+    loop decide whether an ad changed without opening its detail page.
+    """
+
+    def __init__(self, path: str):
+        self.path    = path
+        self.today   = datetime.date.today().isoformat()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def is_known(self, ad_id: str, card_text: str) -> bool:
+        """
+        True if `ad_id` was scraped before and its card is unchanged.
+        Known ads are marked as seen today.
+        """
+        entry = self.entries.get(ad_id)
+        if entry is None or entry.get("card_hash") != content_hash(card_text):
+            return False
+        entry["last_seen"] = self.today
+        return True
+
+    def record(self, ad_id: str, card_text: str, job: dict, path: str):
+        """Store (or refresh) an ad after its detail page was scraped."""
+        entry = self.entries.setdefault(ad_id, {"first_seen": self.today})
+        entry.update({
+            "card_hash":    content_hash(card_text),
+            "content_hash": job_hash(job),
+            "last_seen":    self.today,
+            "file":         path,
+        })
+
+    def save(self):
+        # Write to a temp file first so a crash never leaves half an index
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
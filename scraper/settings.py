@@ -0,0 +1,51 @@
+# scraper/settings.py
+# Scrapy settings for the Platsbanken spider (see scrapy.cfg).
+#
+#   scrapy crawl platsbanken
+#   scrapy crawl platsbanken -s JOBDIR=crawls/platsbanken-1   # pause/resume
+#   scrapy crawl platsbanken -a start_url=http://127.0.0.1:8765/platsbanken/annonser
+#   SCRAPER_HTTPCACHE=1 scrapy crawl platsbanken              # development re-runs
+
+import os
+import datetime
+
+from config.settings     import JOB_DB as DEFAULT_JOB_DB
+from scraper.http_detail import USER_AGENT as BROWSER_USER_AGENT
+
+BOT_NAME         = "platsbanken"
+SPIDER_MODULES   = ["scraper.spiders"]
+NEWSPIDER_MODULE = "scraper.spiders"
+
+USER_AGENT     = BROWSER_USER_AGENT
+ROBOTSTXT_OBEY = True
+
+# Concurrency – AutoThrottle adapts the actual rate to server latency
+CONCURRENT_REQUESTS            = 32
+CONCURRENT_REQUESTS_PER_DOMAIN = 16
+DOWNLOAD_TIMEOUT               = 30
+
+AUTOTHROTTLE_ENABLED            = True
+AUTOTHROTTLE_START_DELAY        = 0.5
+AUTOTHROTTLE_MAX_DELAY          = 10.0
+AUTOTHROTTLE_TARGET_CONCURRENCY = 8.0
+
+RETRY_ENABLED = True
+RETRY_TIMES   = 2
+
+# On-disk HTTP cache (under .scrapy/) so development re-runs don't refetch.
+# Off by default: a cached listing page would hide ads posted since the last crawl.
+# Turn it on with SCRAPER_HTTPCACHE=1 or -s HTTPCACHE_ENABLED=1.
+HTTPCACHE_ENABLED         = os.getenv("SCRAPER_HTTPCACHE") == "1"
+HTTPCACHE_DIR             = "httpcache"
+HTTPCACHE_EXPIRATION_SECS = 24 * 60 * 60
+HTTPCACHE_IGNORE_HTTP_CODES = [500, 502, 503, 504, 408, 429]
+
+# Same NNN-slug.txt files as main.py, in today's date folder, plus the job store
+ITEM_PIPELINES = {
+    "scraper.pipelines.JobFilePipeline":  300,
+    "scraper.pipelines.JobStorePipeline": 400,
+}
+JOB_OUTPUT_DIR = datetime.date.today().isoformat()
+JOB_DB         = str(DEFAULT_JOB_DB)
+
+FEED_EXPORT_ENCODING = "utf-8"
@@ -0,0 +1,59 @@
+# scraper/spiders/platsbanken.py
+
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import scrapy
+
+from scraper.http_detail import parse_detail_html
+
+START_URL = (
+    "https://arbetsformedlingen.se/platsbanken/annonser"
+    "?p=5:DJh5_yyF_hEM;5:Fv7d_YhP_YmS&l=2:CifL_Rzy_Mku"
+)
+
+def with_page(url: str, page: int) -> str:
+    """Return `url` with its `page` query parameter set to `page`."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k != "page"]
+    query.append(("page", str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query, safe=":;")))
+
+class PlatsbankenSpider(scrapy.Spider):
+    """
+    Crawl the listing pages and every ad on them, yielding the same job
+    records main.py writes. Run with `-a start_url=...` to point it at a
+    different search or at scraper/fixture_server.py.
+    """
+
+    name = "platsbanken"
+
+    def __init__(self, start_url: str = START_URL, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.start_url = start_url
+
+    async def start(self):
+        yield scrapy.Request(self.start_url, callback=self.parse, cb_kwargs={"page": 1})
+
+    def parse(self, response, page: int):
+        self.logger.info(f"=== Page {page} ===")
+
+        links = response.xpath("//a[contains(@href,'/platsbanken/annonser/')]/@href").getall()
+        for href in dict.fromkeys(links):
+            yield response.follow(href, callback=self.parse_detail)
+
+        if response.xpath("//button[.//span[contains(text(),'Nästa')]]"):
+            yield scrapy.Request(
+                with_page(response.url, page + 1),
+                callback=self.parse,
+                cb_kwargs={"page": page + 1},
+            )
+
+    def parse_detail(self, response):
+        job = parse_detail_html(response.text, response.url)
+        if job is None:
+            # Client-rendered page: nothing to extract without a browser
+            self.logger.warning(f"No static content at {response.url}")
+            self.crawler.stats.inc_value("platsbanken/no_static_content")
+            return
+        yield job
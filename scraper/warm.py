@@ -0,0 +1,73 @@
+# scraper/warm.py
+"""
+Keep headless Firefox sessions running between scrape runs.
+
+    python -m scraper.warm --sessions 3 &
+    python main.py --attach
+
+The first session serves the listing, the rest are handed to the detail pool,
+so the 5–10 s browser cold start is paid once per session instead of per run.
+Session details are written to WARM_STATE; stop with Ctrl-C.
+"""
+
+import os
+import json
+import time
+import signal
+import argparse
+
+from scraper.browser import PROFILES, make_driver, resolve_driver_path, attach_driver
+
+WARM_STATE = os.getenv("SCRAPER_WARM_STATE", ".warm_sessions.json")
+
+def _stop(signum, frame):
+    raise KeyboardInterrupt
+
+def load_warm_drivers() -> list:
+    """Attach to every live warm session listed in WARM_STATE."""
+    if not os.path.exists(WARM_STATE):
+        return []
+    with open(WARM_STATE, encoding="utf-8") as f:
+        sessions = json.load(f)
+    drivers = []
+    for s in sessions:
+        driver = attach_driver(s["url"], s["session_id"])
+        if driver is not None:
+            drivers.append(driver)
+    return drivers
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep warm Firefox sessions for main.py --attach.")
+    parser.add_argument("--sessions", type=int, default=1 + (os.cpu_count() or 1))
+    parser.add_argument("--profile",  choices=PROFILES, default="lean")
+    args = parser.parse_args()
+
+    driver_path = resolve_driver_path()
+    drivers = []
+    try:
+        for i in range(args.sessions):
+            t0 = time.perf_counter()
+            driver = make_driver(driver_path, profile=args.profile, profile_name=f"warm-{i}")
+            drivers.append(driver)
+            print(f"[Warm] session {i} up in {time.perf_counter() - t0:.1f} s")
+
+        with open(WARM_STATE, "w", encoding="utf-8") as f:
+            json.dump([
+                {"url": d.service.service_url, "session_id": d.session_id}
+                for d in drivers
+            ], f, indent=1)
+        print(f"[Warm] {len(drivers)} session(s) ready, state in {WARM_STATE}")
+
+        signal.signal(signal.SIGTERM, _stop)
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for d in drivers:
+            d.quit()
+        if os.path.exists(WARM_STATE):
+            os.remove(WARM_STATE)
+
+if __name__ == "__main__":
+    main()
@@ -4,24 +4,84 @@
 import os
 import re
 import time
+import asyncio
+import argparse
 import yaml
 import openai
 from dotenv import load_dotenv
 from pathlib import Path
 
 # ─── Local modules ────────────────────────────────────────────────────────────
-from data.resume_utils       import extract_resume_text
-from generators.cover_letter import generate_cover_letter
-from emailer.gmail_sender    import send_application
-from config.settings         import PERSONA_YAML, RESUME_PDF
+from data.resume_utils       import load_resume
+from generators.cover_letter import (
+    generate_cover_letters_async, letter_cache, usage_summary, timing_summary,
+)
+from generators.batch        import generate_cover_letters_batch
+from generators.rate_limit   import RateLimiter
+from emailer.gmail_sender    import GmailSender
+from emailer.mail_queue      import MailQueue
+from emailer.outbox          import Outbox
+from emailer.send_ledger     import SendLedger, ledger_key
+from data.job_store          import JobStore
+from data.job_files          import read_job
+from data.dedup              import mark_duplicates, skip_duplicates
+from data.relevance          import rank_jobs
+from config.settings         import (
+    PERSONA_YAML, RESUME_PDF, OPENAI_CONCURRENCY, RELEVANCE_THRESHOLD, RELEVANCE_TOP_K,
+    SMTP_PER_MINUTE, SMTP_DAILY_CAP, MAIL_FROM,
+)
+
+# ─── 0) Options, env & OpenAI key ─────────────────────────────────────────────
+parser = argparse.ArgumentParser(description="Generate and send applications for the latest scrape.")
+parser.add_argument(
+    "--batch", action="store_true",
+    help="generate letters through the OpenAI Batch API (half price, up to 24 h)"
+)
+parser.add_argument(
+    "--force", action="store_true",
+    help="regenerate every letter instead of reusing cached ones"
+)
+parser.add_argument(
+    "--stream", action="store_true",
+    help="stream responses and log each letter's progress (not with --batch)"
+)
+parser.add_argument(
+    "--per-minute", type=float, default=SMTP_PER_MINUTE,
+    help="emails sent per minute at most"
+)
+parser.add_argument(
+    "--daily-cap", type=int, default=SMTP_DAILY_CAP,
+    help="emails sent per day at most, counted across runs"
+)
+parser.add_argument(
+    "--no-send", action="store_true",
+    help="only generate and spool emails to the outbox; send later with `python -m emailer.outbox send`"
+)
+parser.add_argument(
+    "--resend", action="store_true",
+    help="also apply to jobs the send ledger says were already emailed"
+)
+parser.add_argument(
+    "--min-score", type=float, default=RELEVANCE_THRESHOLD,
+    help="skip jobs matching the resume less than this share of the day's best match"
+)
+parser.add_argument(
+    "--top-k", type=int, default=RELEVANCE_TOP_K,
+    help="apply to at most this many of the best-matching jobs (0 = no limit)"
+)
+args = parser.parse_args()
 
-# ─── 0) Load env & OpenAI key ─────────────────────────────────────────────────
 load_dotenv()  # loads OPENAI_API_KEY, GMAIL_USER, GMAIL_APP_PASS
 
 openai.api_key = os.getenv("OPENAI_API_KEY")
 if not openai.api_key:
     raise RuntimeError("Set OPENAI_API_KEY in your .env")
 
+# Spooled emails need a From address even when nothing is sent this run
+from_address = MAIL_FROM or os.getenv("GMAIL_USER")
+if not from_address:
+    raise RuntimeError("Set GMAIL_USER in your .env (or MAIL_FROM in config/settings.py)")
+
 # ─── 1) Load persona.yaml ────────────────────────────────────────────────────
 persona_path = Path(PERSONA_YAML)
 if not persona_path.exists():
@@ -29,11 +89,11 @@ if not persona_path.exists():
 with persona_path.open(encoding="utf-8") as f:
     persona = yaml.safe_load(f)
 
-# ─── 2) Extract resume text once ──────────────────────────────────────────────
+# ─── 2) Load the cleaned resume once ───────────────────────────────────────────
 resume_path = Path(RESUME_PDF)
 if not resume_path.exists():
     raise RuntimeError(f"Resume PDF not found: {resume_path}")
-resume_text = extract_resume_text(str(resume_path))
+resume_text = load_resume(str(resume_path))
 
 # ─── 3) Discover latest scrape folder ─────────────────────────────────────────
 raw_root = Path("output") / "raw"
@@ -43,40 +103,37 @@ if not date_dirs:
 date_folder = date_dirs[-1]
 print(f"Sending applications for jobs in: {date_folder}")
 
+# ─── 3b) Read the day's jobs and mark near-duplicates (one letter per role) ──
+job_files = sorted(date_folder.glob("*.txt"))
+day_jobs  = [read_job(str(p)) for p in job_files]
+with JobStore() as store:
+    store.upsert_jobs([job for job in day_jobs if job.get("url")], date_folder.name)
+    clusters, dups = mark_duplicates(store)
+    duplicate_urls = store.duplicate_urls()
+print(f"Found {clusters} duplicate clusters ({dups} copies across the job store)")
+
 # ─── 4) Email‐validation regex ────────────────────────────────────────────────
 EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
 
-# ─── 5) Helper: parse a single job file ───────────────────────────────────────
-def parse_job(path: Path) -> dict:
-    lines = path.read_text(encoding="utf-8").splitlines()
-    job = {}
-    for i, line in enumerate(lines):
-        if line.startswith("Title:"):
-            job["title"] = line.split("Title:",1)[1].strip()
-        elif line.startswith("Company:"):
-            job["company"] = line.split("Company:",1)[1].strip() or "Hiring Team"
-        elif line.startswith("Location:"):
-            job["location"] = line.split("Location:",1)[1].strip()
-        elif line.startswith("Description:"):
-            desc = []
-            for dl in lines[i+1:]:
-                if dl.startswith("Contact Email:") or dl.startswith("URL:"):
-                    break
-                desc.append(dl)
-            job["description"] = "\n".join(desc).strip()
-        elif line.startswith("Contact Email:"):
-            job["email"] = line.split("Contact Email:",1)[1].strip()
-        elif line.startswith("URL:"):
-            job["url"] = line.split("URL:",1)[1].strip()
-    return job
-
-# ─── 6) Loop & send ───────────────────────────────────────────────────────────
-job_files = sorted(date_folder.glob("*.txt"))
+# ─── 5) Helper: email subject ────────────────────────────────────────────────
+def subject_for(job: dict) -> str:
+    return f"Application for {job['title']} at {job['company']}"
+
+# ─── 6) Pick the jobs worth a letter ─────────────────────────────────────────
+ledger = SendLedger()
+copies = skip_duplicates([job.get("url") for job in day_jobs if job.get("url")],
+                         duplicate_urls, ledger.ad_sent_at)
 print(f"Found {len(job_files)} job files. Starting…\n")
 
-for idx, job_file in enumerate(job_files, start=1):
-    print(f"[{idx}/{len(job_files)}] {job_file.name}")
-    job = parse_job(job_file)
+todo       = []
+candidates = []   # indexes into day_jobs of the jobs in todo
+for idx, (job_file, job) in enumerate(zip(job_files, day_jobs)):
+    # — Skip copies of an ad we already (or will) apply to —
+    if job.get("url") in copies:
+        print(f"  ⏭️ Skipping {job_file.name}: duplicate of {copies[job['url']]}")
+        continue
+    if job.get("url") in duplicate_urls:
+        print(f"  ↪️ {job_file.name} stands in for {duplicate_urls[job['url']]} (never applied to)")
 
     # — Validate email address —
     email = job.get("email", "").strip()
@@ -84,28 +141,108 @@ for idx, job_file in enumerate(job_files, start=1):
         print(f"  ⚠️ Skipping {job_file.name}: invalid or missing email ({email!r}) ⚠️ ")
         continue
 
-    try:
-        # Generate the letter
-        print("Generating cover letter…")
-        cover_letter = generate_cover_letter(persona, resume_text, job)
-
-        # Prepare subject
-        subject = f"Application for {job['title']} at {job['company']}"
+    # — Never email the same employer about the same ad twice —
+    sent_at = None if args.resend else ledger.sent_at(ledger_key(email, job.get("url"), subject_for(job)))
+    if sent_at:
+        print(f"  ⏭️ Skipping {job_file.name}: already sent to {email} on {sent_at[:10]}")
+        continue
 
-        # Send email (attaches your resume automatically)
-        send_application(
-            to_address      = email,
-            subject         = subject,
-            body_text       = cover_letter,
-            attachment_path = str(resume_path)
+    todo.append((job_file, job, email))
+    candidates.append(idx)
+
+# ─── 6b) Keep only the best matches for the resume and skills ────────────────
+t0 = time.perf_counter()
+ranked = rank_jobs(
+    day_jobs, resume_text, persona.get("skills", []),
+    args.min_score, args.top_k, candidates=candidates,
+)
+by_job = {idx: pos for pos, idx in enumerate(candidates)}
+print(f"\nRanked {len(day_jobs)} jobs in {1000 * (time.perf_counter() - t0):.0f} ms; "
+      f"keeping {len(ranked)} of {len(todo)} (min score {args.min_score}, top {args.top_k or 'all'})")
+for idx, score in ranked:
+    print(f"  {score:4.2f}  {todo[by_job[idx]][0].name}: {day_jobs[idx].get('title', '')}")
+todo = [todo[by_job[idx]] for idx, _ in ranked]
+
+# ─── 7) Generate letters, spool them and send them as they come in ───────────
+outbox  = Outbox(ledger=ledger)
+pending = outbox.pending()
+spooled = outbox.pending_keys()
+before  = len(todo)
+todo    = [(f, job, email) for f, job, email in todo if (email, job.get("url")) not in spooled]
+if pending:
+    print(f"📮 {len(pending)} emails from an earlier run are waiting in the outbox "
+          f"({before - len(todo)} of today's jobs among them)")
+
+def spool(mail: MailQueue | None, idx: int, cover_letter):
+    """Write the finished email to the outbox, then queue it for sending."""
+    job_file, job, email = todo[idx]
+    if isinstance(cover_letter, Exception):
+        print(f"  ❌ Error on {job_file.name}: {cover_letter}")
+        return
+    entry = outbox.add(
+        job_file.name,
+        from_address    = from_address,
+        to_address      = email,
+        subject         = subject_for(job),
+        body_text       = cover_letter,
+        attachment_path = str(resume_path),   # attaches your resume
+        url             = job.get("url"),
+    )
+    if mail:
+        mail.put(job_file.name, entry=entry, to_address=email)
+
+async def generate_and_send(sender: GmailSender | None) -> MailQueue | None:
+    """Generate and spool every letter; with a `sender`, send them as they come in."""
+    mail = None
+    if sender is not None:
+        mail = MailQueue(sender, per_minute=args.per_minute, daily_cap=args.daily_cap,
+                         send=lambda entry, **_: outbox.deliver(entry, sender))
+        drain = asyncio.create_task(mail.run())
+        for entry in pending:
+            meta = outbox.meta(entry)
+            mail.put(meta["label"], entry=entry, to_address=meta["to"])
+
+    jobs = [job for _, job, _ in todo]
+    t0   = time.perf_counter()
+    if args.batch:
+        print(f"\nGenerating {len(todo)} cover letters via the Batch API…")
+        letters = await asyncio.to_thread(
+            generate_cover_letters_batch,
+            persona, resume_text, jobs, name=date_folder.name, force=args.force,
         )
-
-        print("  ✅ Sent!")
-    except Exception as e:
-        print(f"  ❌ Error on {job_file.name}: {e}")
-
-    # brief pause to avoid rate limits
-    time.sleep(3)
+        for idx, cover_letter in enumerate(letters):
+            spool(mail, idx, cover_letter)
+    else:
+        print(f"\nGenerating {len(todo)} cover letters ({OPENAI_CONCURRENCY} at a time)"
+              + ("…" if args.no_send else f", sending up to {args.per_minute}/min…"))
+        limiter = RateLimiter()
+        await generate_cover_letters_async(
+            persona, resume_text, jobs, force=args.force, stream=args.stream,
+            limiter=limiter, on_letter=lambda idx, l: spool(mail, idx, l),
+        )
+        print(f"Rate limiting: {limiter.summary()}")
+    print(f"Generated in {time.perf_counter() - t0:.1f} s ({letter_cache().summary()})")
+    if mail:
+        print(f"{mail.queue.qsize()} emails still queued")
+        await mail.close()
+        await drain
+    return mail
+
+# ─── 8) Send over one SMTP session for the whole run ─────────────────────────
+if args.no_send:
+    mail = asyncio.run(generate_and_send(None))
+else:
+    with GmailSender() as sender:
+        mail = asyncio.run(generate_and_send(sender))
+        print(f"SMTP: {sender.connects} logins, {sender.reconnects} reconnects")
+counts = outbox.counts()
+print(f"📮 Outbox: {counts['new']} waiting, {counts['sent']} sent, {counts['failed']} failed"
+      + (" (send them with: python -m emailer.outbox send)" if counts["new"] else ""))
+if mail and mail.unsent:
+    print(f"⏸️ {len(mail.unsent)} applications left for tomorrow (daily cap {args.daily_cap})")
 
 print("\n ✅ All done sending applications! ✅ ")
-
+print(f"Run summary: {letter_cache().summary()}")
+print(f"Token usage: {usage_summary()}")
+if args.stream:
+    print(f"Latency:     {timing_summary()}")
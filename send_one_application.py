@@ -18,42 +18,24 @@ import yaml
 import openai
 
 # ─── 2) Now import your local modules ────────────────────────────────────────
-from data.resume_utils       import extract_resume_text
-from generators.cover_letter import generate_cover_letter
+from data.resume_utils       import load_resume
+from generators.cover_letter import stream_cover_letter, timing_summary
 from emailer.gmail_sender    import send_application
+from emailer.send_ledger     import SendLedger, ledger_key
+from data.job_files          import read_job
 from config.settings         import PERSONA_YAML, RESUME_PDF
 
-# ─── 3) Job‐parsing helper ────────────────────────────────────────────────────
-def parse_job(path: Path) -> dict:
-    lines = path.read_text(encoding="utf-8").splitlines()
-    job = {}
-    for i, line in enumerate(lines):
-        if line.startswith("Title:"):
-            job["title"] = line.split("Title:",1)[1].strip()
-        elif line.startswith("Company:"):
-            job["company"] = line.split("Company:",1)[1].strip() or "Hiring Team"
-        elif line.startswith("Location:"):
-            job["location"] = line.split("Location:",1)[1].strip()
-        elif line.startswith("Description:"):
-            desc = []
-            for dl in lines[i+1:]:
-                if dl.startswith("Contact Email:") or dl.startswith("URL:"):
-                    break
-                desc.append(dl)
-            job["description"] = "\n".join(desc).strip()
-        elif line.startswith("Contact Email:"):
-            job["email"] = line.split("Contact Email:",1)[1].strip()
-        elif line.startswith("URL:"):
-            job["url"] = line.split("URL:",1)[1].strip()
-    return job
-
-# ─── 4) Main flow ─────────────────────────────────────────────────────────────
+# ─── 3) Main flow ─────────────────────────────────────────────────────────────
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python send_one_application.py <PATH_TO_JOB_TXT>")
+    argv   = sys.argv[1:]
+    resend = "--resend" in argv
+    if resend:
+        argv.remove("--resend")
+    if len(argv) != 1:
+        print("Usage: python send_one_application.py [--resend] <PATH_TO_JOB_TXT>")
         sys.exit(1)
 
-    job_path = Path(sys.argv[1])
+    job_path = Path(argv[0])
     if not job_path.exists():
         print(f"Error: file not found: {job_path}")
         sys.exit(1)
@@ -62,19 +44,27 @@ def main():
     with open(PERSONA_YAML, encoding="utf-8") as f:
         persona = yaml.safe_load(f)
 
-    # Extract resume text
-    resume_text = extract_resume_text(str(RESUME_PDF))
+    # Load the cleaned resume
+    resume_text = load_resume(str(RESUME_PDF))
 
     # Parse the job file
-    job = parse_job(job_path)
+    job = read_job(str(job_path))
     print(f"🔍 Parsed job: {job['title']} at {job['company']} → {job['email']}")
 
+    # Don't pay for a letter that was already sent
+    subject = f"Application for {job['title']} at {job['company']}"
+    ledger  = SendLedger()
+    sent_at = ledger.sent_at(ledger_key(job["email"], job.get("url"), subject))
+    if sent_at and not resend:
+        print(f"⏭️  Already sent to {job['email']} on {sent_at[:10]} (pass --resend to send again)")
+        sys.exit(0)
+
     # Generate the letter
-    print("📝 Generating cover letter…")
-    cover_letter = generate_cover_letter(persona, resume_text, job)
+    print("📝 Generating cover letter…\n")
+    cover_letter = stream_cover_letter(persona, resume_text, job)
+    print(f"\n⏱️  {timing_summary()}")
 
     # Send the email
-    subject = f"Application for {job['title']} at {job['company']}"
     print(f"✉️  Sending to {job['email']}…")
     send_application(
         to_address      = job["email"],
@@ -82,6 +72,7 @@ def main():
         body_text       = cover_letter,
         attachment_path = str(RESUME_PDF)
     )
+    ledger.record(job["email"], job.get("url"), subject, job_path.name)
 
     print("Done!")
 
@@ -0,0 +1,26 @@
+# tests/test_gmail_sender.py
+
+import smtplib
+
+import pytest
+
+from emailer import smtp_sink
+from emailer.gmail_sender import GmailSender
+
+@pytest.fixture
+def sink():
+    server = smtp_sink.serve(refuse_data={"refused@example.com"})
+    yield server
+    server.shutdown()
+
+def make_sender(server) -> GmailSender:
+    return GmailSender("me@example.com", "secret", host="127.0.0.1",
+                       port=server.server_address[1], starttls=False)
+
+def test_refused_data_leaves_pooled_session_usable(sink):
+    with make_sender(sink) as sender:
+        with pytest.raises(smtplib.SMTPDataError):
+            sender.send_application("refused@example.com", "Application 1", "Hello")
+        sender.send_application("ok@example.com", "Application 2", "Hello")
+        assert sender.connects == 1   # the same session carried the second email
+    assert sink.stats.messages == 1
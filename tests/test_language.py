@@ -0,0 +1,17 @@
+# tests/test_language.py
+
+import pytest
+
+from generators.language import detect_language
+
+@pytest.mark.parametrize("text, expected", [
+    ("Vi söker en backendutvecklare som vill arbeta med oss i Stockholm.", "sv"),
+    ("We are looking for a backend developer to join our team in Stockholm.", "en"),
+    # No function words at all: decided by å/ä/ö
+    ("Senior Backend Engineer (Python/Go)\nStockholm, hybrid", "en"),
+    ("Requirements\n- Python\n- Docker\n- Kubernetes", "en"),
+    ("Undersköterska till hemtjänst, Göteborg", "sv"),
+    ("Lärare i matematik\nHeltid, tillsvidare", "sv"),
+])
+def test_detect_language(text, expected):
+    assert detect_language(text) == expected